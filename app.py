@@ -1,16 +1,38 @@
 # Importing Libraries
 import pandas as pd
-import numpy as np
-import plotly.express as px
 import streamlit as st
-from streamlit.components.v1 import html
 from streamlit_option_menu import option_menu
+import os
 import warnings
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+import threading
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
-# Importing Our Multipages
-import home
-import products
-import locations
+import incremental
+import duckdb_backend
+import figure_cache
+import disk_store
+import snapshots
+import sampling
+import filter_panel
+import profiling
+
+# Set To 1 To Stream The Source File Into The Cube Instead Of Loading It
+CHUNKED_ENV = "SHOPPING_TRENDS_CHUNKED"
+
+# Query Backend: "pandas" (the in-memory cube) Or "duckdb" (SQL pushdown)
+BACKEND_ENV = "SHOPPING_TRENDS_BACKEND"
+
+# Threads Building The Charts Of A Page Concurrently (0 Builds Them In Order)
+CHART_WORKERS_ENV = "SHOPPING_TRENDS_CHART_WORKERS"
+
+# Our Multipages, Imported Only When Selected So Workers Start Faster
+PAGES = {
+    "Home": "home",
+    "Products": "products",
+    "Locations": "locations",
+    "Distributions": "distributions",
+}
 
 
 def run():
@@ -22,17 +44,131 @@ def run():
 
     warnings.simplefilter(action='ignore', category=FutureWarning)
 
-    # Function To Load Our Dataset
-    @st.cache_data
-    def load_data(the_file_path):
-        df = pd.read_csv(the_file_path)
-        df.columns = df.columns.str.replace(" ", "_")
-        df.rename(
-            columns={"Purchase_Amount_(USD)": "Price_in_USD"}, inplace=True)
-        df.set_index("Customer_ID", inplace=True)
-        return df
+    timer = profiling.StageTimer(profiling.profiling_enabled(st.query_params))
 
-    df = load_data("shopping_trends_updated.csv")
+    # Function To Load And Pre-Aggregate Our Dataset Once Per Process
+    # (rows appended to the file later are picked up by refresh; in chunked
+    # mode the rows are streamed and never held in memory; the duckdb
+    # backend keeps them in DuckDB and answers every query in SQL)
+    @st.cache_resource
+    def load_data(the_file_path):
+        if os.environ.get(BACKEND_ENV, "pandas") == "duckdb":
+            return duckdb_backend.DuckDBDataset(the_file_path)
+
+        return incremental.IncrementalDataset(
+            the_file_path, chunked=os.environ.get(CHUNKED_ENV, "") == "1",
+            approximate=os.environ.get(sampling.APPROXIMATE_ENV, "") == "1",
+            store=load_store())
+
+    # Aggregates And Figures On Disk, Shared By Workers And Kept Over Restarts
+    @st.cache_resource
+    def load_store():
+        return disk_store.DiskStore()
+
+    # One Figure Cache Shared By Every Session
+    @st.cache_resource
+    def load_figure_cache():
+        return figure_cache.FigureCache(store=load_store())
+
+    # Default-View KPIs And Figures, Warmed Up Per Dataset Version
+    @st.cache_resource
+    def load_snapshots():
+        return snapshots.Snapshots(load_figure_cache())
+
+    def warm_snapshots(the_cube, ctx):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        snapshot.warm(the_cube)
+
+    # One Chart-Building Pool Shared By Every Session
+    @st.cache_resource
+    def load_executor():
+        workers = int(os.environ.get(CHART_WORKERS_ENV,
+                                     min(4, os.cpu_count() or 1)))
+        return ThreadPoolExecutor(workers) if workers > 0 else None
+
+    def load_page(page):
+        with timer.stage("import_page"):
+            return profiling.timed_import(PAGES[page])
+
+    def show_kpi(kpi, the_slice, filters):
+        st.subheader(timer.time(kpi.__name__, snapshot.kpi, kpi, the_slice,
+                                filters, data_cube.version))
+
+        # Sampled Estimates Come With Their 95% Confidence Interval
+        margin = sampling.kpi_margin(kpi, the_slice)
+        if margin is not None:
+            st.caption(f"{margin} (95% CI)")
+
+    # Rerun Once The Exact Cube Has Replaced The Sampled One
+    @st.fragment(run_every=incremental.REFRESH_SECONDS)
+    def wait_for_exact():
+        if not isinstance(dataset.cube, sampling.SampleCube):
+            st.rerun()
+
+    # Unchanged Filters On Unchanged Data Reuse The Session's Last Slice
+    def filter_slice(filter_data, *filters):
+        key = (filter_data.__module__, figure_cache.normalize_filters(filters),
+               data_cube.version)
+        last = st.session_state.get("last_slice")
+        if last is not None and last[0] == key:
+            return last[1]
+
+        the_slice = timer.time("filter", filter_data, data_cube, *filters)
+        st.session_state["last_slice"] = (key, the_slice)
+        return the_slice
+
+    def build_chart(create, the_slice, filters, ctx=None):
+        # Let Streamlit Caches Used By The Chart Code See The Session
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+
+        with timer.stage(f"{create.__name__}.build"):
+            return figures.figure(create, the_slice, filters, data_cube.version)
+
+    # Start Building Every Chart Of The Page Before The First One Is Shown
+    def build_charts(creates, the_slice, filters):
+        # Builds Still Queued For This Session's Previous Rerun Are Stale
+        for future in st.session_state.get("chart_futures", []):
+            future.cancel()
+
+        charts = {}
+        for create in creates:
+            if executor is None:
+                charts[create] = Future()
+                charts[create].set_result(
+                    build_chart(create, the_slice, filters))
+            else:
+                charts[create] = executor.submit(build_chart, create,
+                                                 the_slice, filters,
+                                                 get_script_run_ctx())
+
+        st.session_state["chart_futures"] = list(charts.values())
+        return charts
+
+    # Each Chart Gets Its Place In The Layout Up Front...
+    def place_chart(create):
+        chart_slots[create] = st.empty()
+        chart_slots[create].caption("Loading chart…")
+
+    # ...And Is Drawn There As Soon As Its Build Finishes
+    def show_charts(charts):
+        creates = {future: create for create, future in charts.items()}
+        for future in as_completed(creates):
+            create = creates[future]
+            with timer.stage(f"{create.__name__}.show"):
+                chart_slots[create].plotly_chart(future.result(),
+                                                 use_container_width=True)
+
+        # Drawn Figures Needn't Stay Alive In The Session
+        st.session_state["chart_futures"] = []
+
+    with timer.stage("load_data"):
+        dataset = load_data("shopping_trends_updated.csv")
+        dataset.refresh()
+        data_cube = dataset.cube
+        figures = load_figure_cache()
+        executor = load_executor()
+        snapshot = load_snapshots()
 
     st.markdown(
         """
@@ -98,12 +234,14 @@ def run():
 
     header = st.container()
     content = st.container()
+    chart_slots = {}
 
     with st.sidebar:
         page = option_menu(
             menu_title='Sidebar',
-            options=['Home', 'Products', "Locations"],
-            icons=['house-fill', 'person-circle', "map-fill"],
+            options=list(PAGES),
+            icons=['house-fill', 'person-circle', "map-fill",
+                   "bar-chart-fill"],
             menu_icon='chat-text-fill',
             default_index=0,
             styles={
@@ -116,168 +254,220 @@ def run():
 
         )
 
+        timer.page = page
         st.write("***")
 
-        # Get All Locations as a list
-        location_options = sorted(df["Location"].unique().tolist())
-        location_options.insert(0, "ALL")
+        if isinstance(data_cube, sampling.SampleCube):
+            st.caption("Estimated from a sample, exact figures are loading…")
+            wait_for_exact()
 
         # Home Page
         if page == "Home":
-            category_filter = st.multiselect("Select The Category 👕💎",
-                                             options=sorted(
-                                                 df["Category"].unique().tolist()),
-                                             default=sorted(
-                                                 df["Category"].unique().tolist()))
-
-            size_filter = st.multiselect("Select The Size 👔",
-                                         options=sorted(
-                                             df["Size"].unique().tolist()),
-                                         default=sorted(
-                                             df["Size"].unique().tolist()))
-
-            location_filter = st.selectbox("Select The Location 🌏",
-                                           options=location_options,
-                                           index=0)
+            home = load_page(page)
+            category_filter, size_filter, location_filter = \
+                filter_panel.filter_panel(data_cube, filter_panel.CATEGORY,
+                                          filter_panel.SIZE,
+                                          filter_panel.LOCATION)
 
             with header:
                 home.home_header()
 
             with content:
-                df_filtered = home.filter_data(df, category_filter,
-                                               size_filter, location_filter)
+                cube_slice = filter_slice(home.filter_data, category_filter,
+                                          size_filter, location_filter)
+                filters = (category_filter, size_filter, location_filter)
+                charts = build_charts([home.create_category_chart,
+                                       home.create_gender_chart,
+                                       home.create_shipping_chart],
+                                      cube_slice, filters)
 
                 left_col, mid_col, right_col = st.columns(3)
 
                 with left_col:
                     st.subheader("Total Customers")
-                    st.subheader(home.total_customers(df_filtered))
+                    show_kpi(home.total_customers, cube_slice, filters)
 
                 with mid_col:
                     st.subheader("Average Rating")
-                    st.subheader(home.avergae_rating(df_filtered))
+                    show_kpi(home.avergae_rating, cube_slice, filters)
 
                 with right_col:
                     st.subheader("Total Purchases")
-                    st.subheader(home.total_purchases(df_filtered))
+                    show_kpi(home.total_purchases, cube_slice, filters)
 
                 st.markdown("---")
 
                 left_chart, right_chart = st.columns(2)
                 with left_chart:
-                    st.plotly_chart(home.create_category_chart(
-                        df_filtered), use_container_width=True)
+                    place_chart(home.create_category_chart)
 
                 with right_chart:
-                    st.plotly_chart(home.create_gender_chart(
-                        df_filtered), use_container_width=True)
+                    place_chart(home.create_gender_chart)
 
                 st.markdown("---")
-                st.plotly_chart(home.create_shipping_chart(
-                    df_filtered), use_container_width=True)
+                place_chart(home.create_shipping_chart)
+
+                show_charts(charts)
 
         # Products Page
         if page == "Products":
-            category_filter = st.multiselect("Select The Category 👕💎",
-                                             options=sorted(
-                                                 df["Category"].unique().tolist()),
-                                             default=sorted(
-                                                 df["Category"].unique().tolist()))
-
-            size_filter = st.multiselect("Select The Size 👔",
-                                         options=sorted(
-                                             df["Size"].unique().tolist()),
-                                         default=sorted(
-                                             df["Size"].unique().tolist()))
-
-            location_filter = st.selectbox("Select The Location 🌏",
-                                           options=location_options,
-                                           index=0)
+            products = load_page(page)
+            category_filter, size_filter, location_filter = \
+                filter_panel.filter_panel(data_cube, filter_panel.CATEGORY,
+                                          filter_panel.SIZE,
+                                          filter_panel.LOCATION)
             with header:
                 products.products_header()
 
             with content:
-                df_filtered = products.filter_data(df, category_filter,
-                                                   size_filter, location_filter)
+                cube_slice = filter_slice(products.filter_data, category_filter,
+                                          size_filter, location_filter)
+                filters = (category_filter, size_filter, location_filter)
+                charts = build_charts([products.create_products_chart,
+                                       products.create_size_chart,
+                                       products.category_via_season_chart],
+                                      cube_slice, filters)
 
                 left_col, mid_col, right_col = st.columns(3)
 
                 with left_col:
                     st.image("imgs/dollar.png", caption="", width=70)
                     st.subheader("Total Sales")
-                    st.subheader(products.total_sales(df_filtered))
+                    show_kpi(products.total_sales, cube_slice, filters)
 
                 with mid_col:
                     st.image("imgs/clothes.png", width=70)
                     st.subheader("Categories")
-                    st.subheader(products.number_of_category(df))
+                    st.subheader(products.number_of_category(data_cube))
 
                 with right_col:
                     st.image("imgs/online-shopping.png", width=70)
                     st.subheader("Products")
-                    st.subheader(products.number_of_products(df_filtered))
+                    show_kpi(products.number_of_products, cube_slice, filters)
                 st.markdown("---")
 
                 products_left_chart, products_right_chart = st.columns([7, 5])
 
                 with products_left_chart:
-                    st.plotly_chart(products.create_products_chart(df_filtered),
-                                    use_container_width=True)
+                    place_chart(products.create_products_chart)
 
                 with products_right_chart:
-                    st.plotly_chart(products.create_size_chart(
-                        df_filtered), use_container_width=True)
+                    place_chart(products.create_size_chart)
+
+                place_chart(products.category_via_season_chart)
 
-                st.plotly_chart(
-                    products.category_via_season_chart(df_filtered),
-                    use_container_width=True)
+                show_charts(charts)
 
         # Locations Page
         if page == "Locations":
+            locations = load_page(page)
 
-            category_filter = st.multiselect("Select The Category 👕💎",
-                                             options=sorted(
-                                                 df["Category"].unique().tolist()),
-                                             default=sorted(
-                                                 df["Category"].unique().tolist()))
-
-            size_filter = st.multiselect("Select The Size 👔",
-                                         options=sorted(
-                                             df["Size"].unique().tolist()),
-                                         default=sorted(
-                                             df["Size"].unique().tolist()))
-
-            season_filter = st.multiselect("Select The Season :snowflake::sunny:",
-                                           options=sorted(
-                                               df["Season"].unique().tolist()),
-                                           default=sorted(
-                                               df["Season"].unique().tolist()))
+            category_filter, size_filter, season_filter = \
+                filter_panel.filter_panel(data_cube, filter_panel.CATEGORY,
+                                          filter_panel.SIZE,
+                                          filter_panel.SEASON)
             with header:
                 locations.sales_header()
 
             with content:
-                df_filtered = locations.filter_data(df, category_filter,
-                                                    size_filter, season_filter)
+                cube_slice = filter_slice(locations.filter_data, category_filter,
+                                          size_filter, season_filter)
+                filters = (category_filter, size_filter, season_filter)
+                charts = build_charts([locations.create_map,
+                                       locations.create_subscription_via_location,
+                                       locations.create_location_category,
+                                       locations.create_top3_review],
+                                      cube_slice, filters)
 
-                st.plotly_chart(locations.create_map(df_filtered),
-                                use_container_width=True)
+                place_chart(locations.create_map)
 
                 st.markdown("---")
 
-                st.plotly_chart(locations.create_subscription_via_location(df_filtered),
-                                use_container_width=True)
+                place_chart(locations.create_subscription_via_location)
 
                 st.markdown("---")
 
                 l_c, r_c = st.columns([7, 5])
                 with l_c:
 
-                    st.plotly_chart(locations.create_location_category(df_filtered),
-                                    use_container_width=True)
+                    place_chart(locations.create_location_category)
 
                 with r_c:
-                    st.plotly_chart(locations.create_top3_review(
-                        df_filtered), use_container_width=True)
+                    place_chart(locations.create_top3_review)
+
+                show_charts(charts)
+
+        # Distributions Page
+        if page == "Distributions":
+            distributions = load_page(page)
+
+            category_filter, size_filter, location_filter, season_filter = \
+                filter_panel.filter_panel(data_cube, filter_panel.CATEGORY,
+                                          filter_panel.SIZE,
+                                          filter_panel.LOCATION,
+                                          filter_panel.SEASON)
+            with header:
+                distributions.distributions_header()
+
+            with content:
+                cube_slice = filter_slice(distributions.filter_data,
+                                          category_filter, size_filter,
+                                          location_filter, season_filter)
+                filters = (category_filter, size_filter, location_filter,
+                           season_filter)
+                charts = build_charts([distributions.create_age_chart,
+                                       distributions.create_price_chart,
+                                       distributions.create_rating_chart],
+                                      cube_slice, filters)
+
+                left_col, mid_col, right_col = st.columns(3)
+
+                with left_col:
+                    st.subheader("Median Age")
+                    show_kpi(distributions.median_age, cube_slice, filters)
+
+                with mid_col:
+                    st.subheader("Median Price")
+                    show_kpi(distributions.median_price, cube_slice, filters)
+
+                with right_col:
+                    st.subheader("Median Rating")
+                    show_kpi(distributions.median_rating, cube_slice, filters)
+
+                st.markdown("---")
+
+                left_chart, right_chart = st.columns(2)
+                with left_chart:
+                    place_chart(distributions.create_age_chart)
+
+                with right_chart:
+                    place_chart(distributions.create_rating_chart)
+
+                st.markdown("---")
+                place_chart(distributions.create_price_chart)
+
+                show_charts(charts)
+
+    # Every Version Is Warmed Up In The Background Once This Page Is Drawn, So
+    # The First Paint Only Imports Its Own Page; Each Version Is Tried Once,
+    # A Failed Warm-Up Isn't Retried Every Rerun
+    if snapshot.version != data_cube.version and \
+            snapshot.claim(data_cube.version):
+        threading.Thread(target=warm_snapshots,
+                         args=(data_cube, get_script_run_ctx()),
+                         daemon=True).start()
+
+    # Debug Panel With This Rerun's Stage Timings (Only When Profiling)
+    if timer.enabled:
+        timer.account(st.session_state)
+        timer.publish()
+        with content:
+            with st.expander("Stage Timings"):
+                st.dataframe(pd.DataFrame(timer.stages,
+                                          columns=["Stage", "Seconds"]))
+                st.json(timer.memory)
+                st.code(profiling.prometheus_text())
+                st.json(figures.stats())
 
 
 run()
@@ -0,0 +1,223 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+
+import loader
+import cube
+import figure_cache
+import home
+import products
+import locations
+import distributions
+
+
+SOURCE_FILE = "shopping_trends_updated.csv"
+
+# Rows Written Per Batch While Synthesizing Big Files
+SYNTH_CHUNK_ROWS = 1_000_000
+
+# Numeric Columns Of The Source Schema And How To Draw Them
+NUMERIC_RANGES = {
+    "Age": (18, 71),
+    "Purchase Amount (USD)": (20, 101),
+    "Previous Purchases": (1, 51),
+}
+
+
+def value_pools(the_file_path=SOURCE_FILE):
+    sample = pd.read_csv(the_file_path)
+    pools = {}
+    for col in sample.columns:
+        if not pd.api.types.is_numeric_dtype(sample[col]):
+            pools[col] = np.array(sorted(sample[col].unique()))
+    return sample.columns.tolist(), pools
+
+
+def synthesize(n_rows, the_file_path, seed=0, source=SOURCE_FILE):
+    columns, pools = value_pools(source)
+    rng = np.random.default_rng(seed)
+
+    for start in range(0, n_rows, SYNTH_CHUNK_ROWS):
+        size = min(SYNTH_CHUNK_ROWS, n_rows - start)
+        chunk = {}
+
+        for col in columns:
+            if col == "Customer ID":
+                chunk[col] = np.arange(start + 1, start + size + 1)
+            elif col == "Review Rating":
+                chunk[col] = rng.integers(25, 51, size) / 10
+            elif col in NUMERIC_RANGES:
+                chunk[col] = rng.integers(*NUMERIC_RANGES[col], size)
+            else:
+                chunk[col] = rng.choice(pools[col], size)
+
+        pd.DataFrame(chunk, columns=columns).to_csv(
+            the_file_path, mode="w" if start == 0 else "a",
+            header=start == 0, index=False)
+
+
+def measure(fn, *args, n_rows=None, trace=True):
+    started = time.perf_counter()
+    result = fn(*args)
+    seconds = time.perf_counter() - started
+
+    stats = {"seconds": round(seconds, 6)}
+    if n_rows is not None and seconds > 0:
+        stats["rows_per_second"] = round(n_rows / seconds)
+
+    # Peak Memory Comes From A Second, Traced Run So It Doesn't Skew The Timing
+    if trace:
+        tracemalloc.start()
+        fn(*args)
+        stats["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return result, stats
+
+
+def load_cold(the_file_path, cache_dir):
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    return loader.load_dataset(the_file_path, cache_dir)
+
+
+def random_selection(data_cube, rng):
+    def pick(col):
+        options = data_cube.options(col)
+        size = rng.integers(1, len(options) + 1)
+        return sorted(rng.choice(options, size, replace=False).tolist())
+
+    location = rng.choice(["ALL"] + data_cube.options("Location"))
+    return pick("Category"), pick("Size"), str(location), pick("Season")
+
+
+def page_pipelines(selection):
+    category_filter, size_filter, location_filter, season_filter = selection
+    return {
+        "Home": (home.filter_data,
+                 (category_filter, size_filter, location_filter),
+                 [home.total_customers, home.avergae_rating,
+                  home.total_purchases],
+                 [home.create_category_chart, home.create_gender_chart,
+                  home.create_shipping_chart]),
+        "Products": (products.filter_data,
+                     (category_filter, size_filter, location_filter),
+                     [products.total_sales, products.number_of_products],
+                     [products.create_products_chart,
+                      products.create_size_chart,
+                      products.category_via_season_chart]),
+        "Locations": (locations.filter_data,
+                      (category_filter, size_filter, season_filter),
+                      [],
+                      [locations.create_map,
+                       locations.create_subscription_via_location,
+                       locations.create_location_category,
+                       locations.create_top3_review]),
+        "Distributions": (distributions.filter_data,
+                          (category_filter, size_filter, location_filter,
+                           season_filter),
+                          [distributions.median_age, distributions.median_price,
+                           distributions.median_rating],
+                          [distributions.create_age_chart,
+                           distributions.create_price_chart,
+                           distributions.create_rating_chart]),
+    }
+
+
+def add_stage(stages, name, stats):
+    # Repeated Stages Keep Their Slowest Run
+    if name not in stages or stats["seconds"] > stages[name]["seconds"]:
+        stages[name] = stats
+
+
+def run_pages(data_cube, stages, n_rows, rng, repeat):
+    for _ in range(repeat):
+        pipelines = page_pipelines(random_selection(data_cube, rng))
+
+        for page, (filter_data, filters, kpis, charts) in pipelines.items():
+            the_slice, stats = measure(filter_data, data_cube, *filters,
+                                       n_rows=n_rows)
+            add_stage(stages, f"{page}.filter", stats)
+
+            for kpi in kpis:
+                _, stats = measure(kpi, the_slice)
+                add_stage(stages, f"{page}.{kpi.__name__}", stats)
+
+            for create in charts:
+                fig, stats = measure(create, the_slice)
+                add_stage(stages, f"{page}.{create.__name__}", stats)
+
+                fig_json, stats = measure(figure_cache.compact_json, fig)
+                stats["bytes"] = len(fig_json)
+                stats["full_bytes"] = len(fig.to_json())
+                add_stage(stages, f"{page}.{create.__name__}.json", stats)
+
+
+def run_benchmark(n_rows, work_dir, seed=0, repeat=3):
+    csv_path = os.path.join(work_dir, f"bench_{n_rows}.csv")
+    cache_dir = os.path.join(work_dir, "cache")
+    stages = {}
+
+    _, stages["synthesize"] = measure(synthesize, n_rows, csv_path, seed,
+                                      n_rows=n_rows, trace=False)
+    _, stages["load_cold"] = measure(load_cold, csv_path, cache_dir,
+                                     n_rows=n_rows)
+    df, stages["load_warm"] = measure(loader.load_dataset, csv_path,
+                                      cache_dir, n_rows=n_rows)
+    data_cube, stages["cube"] = measure(cube.from_frame, df, n_rows=n_rows)
+    _, stages["cube_chunked"] = measure(cube.from_csv, csv_path,
+                                        n_rows=n_rows)
+
+    run_pages(data_cube, stages, n_rows, np.random.default_rng(seed), repeat)
+
+    return {
+        "rows": n_rows,
+        "file_bytes": os.path.getsize(csv_path),
+        "frame_bytes": int(df.memory_usage(deep=True).sum()),
+        "cube_cells": len(data_cube.cells),
+        "stages": stages,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the dashboard pipeline on synthetic data.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000],
+                        help="dataset sizes to synthesize")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="random filter selections per page")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args()
+
+    warnings.simplefilter(action='ignore', category=FutureWarning)
+
+    report = {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "runs": [],
+    }
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        for n_rows in args.rows:
+            report["runs"].append(
+                run_benchmark(n_rows, work_dir, args.seed, args.repeat))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+import loader
+from filter_index import FilterIndex
+
+
+# The Sidebar Filter Columns Make Up The Cube Cells
+DIMENSIONS = ["Category", "Size", "Location", "Season"]
+
+# Numeric Columns Summed Per Cell
+MEASURES = ["Price_in_USD", "Previous_Purchases", "Review_Rating"]
+
+# Per-Cell Rows With A Value For Each Measure, The Divisor Of Its Averages
+MEASURE_COUNTS = {measure: f"{measure}_count" for measure in MEASURES}
+
+# Non-Dimension Columns Whose Value Counts Are Kept Per Cell
+COUNT_COLUMNS = ["Gender", "Shipping_Type",
+                 "Item_Purchased", "Subscription_Status"]
+
+
+# Numeric Columns Kept As Per-Cell Histograms: (first, last, step) Of A
+# Fixed Grid. Values Snap To The Nearest Grid Point, So Data Recorded At The
+# Grid's Resolution Is Counted Exactly; Values Past Either End Go To An
+# Underflow Or Overflow Bin, Next To The Exact Lowest And Highest Value
+DISTRIBUTIONS = {
+    "Age": (0, 120, 1),
+    "Price_in_USD": (0, 250, 1),
+    "Review_Rating": (0, 5, 0.1),
+}
+
+
+def distribution_grid(col):
+    first, last, step = DISTRIBUTIONS[col]
+    n_points = int(round((last - first) / step)) + 1
+    return np.round(first + step * np.arange(n_points), 10)
+
+
+def distribution_quantiles(col, counts, lowest, highest, quantiles):
+    """Quantiles from a histogram of a ``DISTRIBUTIONS`` column.
+
+    ``counts`` holds the underflow bin, one count per grid point and the
+    overflow bin. Order statistics on the grid are read off the
+    cumulative counts and interpolated linearly, as ``Series.quantile``
+    does. Past the grid only ``lowest`` and ``highest`` are known, so the
+    ranks in between are spread evenly up to them.
+    """
+    first, last, _ = DISTRIBUTIONS[col]
+    quantiles = np.asarray(quantiles, dtype="float64")
+    index = pd.Index(quantiles, name="quantile")
+
+    cumulative = np.cumsum(counts)
+    n_rows = cumulative[-1]
+    if n_rows == 0:
+        return pd.Series(np.nan, index=index, name=col)
+
+    below, above = counts[0], counts[-1]
+    points = np.concatenate([[np.nan], distribution_grid(col), [np.nan]])
+
+    def order_statistic(ranks):
+        values = points[np.searchsorted(cumulative, ranks, side="right")]
+        under = ranks < below
+        values[under] = lowest + (first - lowest) * ranks[under] / below
+        over = ranks >= n_rows - above
+        values[over] = last + (highest - last) * \
+            (ranks[over] - (n_rows - above) + 1) / above
+        return values
+
+    positions = (n_rows - 1) * quantiles
+    lower = np.floor(positions)
+    low = order_statistic(lower)
+    high = order_statistic(np.ceil(positions))
+    return pd.Series(low + (positions - lower) * (high - low),
+                     index=index, name=col)
+
+
+# Rows Parsed Per Batch When Streaming A Source File
+CHUNK_ROWS = 500_000
+
+# Columns That Hold Whole Numbers Once Partial Aggregates Are Added Up
+INTEGER_COLUMNS = ["Price_in_USD", "Previous_Purchases", "count",
+                   *MEASURE_COUNTS.values()]
+
+
+def aggregate(df):
+    """Cell sums and per-cell value counts of one frame or chunk.
+
+    Returns ``(cells, counts)`` where ``cells`` is indexed by the
+    dimensions and each ``counts[col]`` is a cells x values frame. Both
+    are keyed by plain strings so partial aggregates can be added up.
+    The ``DISTRIBUTIONS`` columns are counted too, over their fixed grid
+    plus an underflow and an overflow bin, which makes their histograms
+    mergeable the same way; their exact lowest and highest values per cell
+    are kept next to the sums.
+
+    Rows missing a dimension belong to no cell and are left out, as no
+    filter selection could match them; missing values of the other
+    columns are left out of their counts.
+    """
+    grouped = df.groupby(DIMENSIONS, observed=True)
+    cell_ids = grouped.ngroup().fillna(-1).to_numpy(dtype="int64")
+    in_cell = cell_ids >= 0
+
+    cells = grouped[MEASURES].sum()
+    cells["Review_Rating"] = cells["Review_Rating"].astype("float64")
+    cells["count"] = grouped.size()
+
+    # Missing Values Are Skipped By The Sums, So Averages Skip Them Too
+    known = grouped[MEASURES].count()
+    for measure in MEASURES:
+        cells[MEASURE_COUNTS[measure]] = known[measure]
+
+    lowest = grouped[list(DISTRIBUTIONS)].min()
+    highest = grouped[list(DISTRIBUTIONS)].max()
+    for col in DISTRIBUTIONS:
+        cells[f"{col}_min"] = lowest[col].astype("float64")
+        cells[f"{col}_max"] = highest[col].astype("float64")
+
+    cells = cells.reset_index()
+    cells[DIMENSIONS] = cells[DIMENSIONS].astype(str)
+    cells = cells.set_index(DIMENSIONS)
+
+    n_cells = len(cells)
+    counts = {}
+
+    for col in COUNT_COLUMNS:
+        values = df[col].astype("category")
+        n_values = len(values.cat.categories)
+        codes = values.cat.codes.to_numpy()
+        known = in_cell & (codes >= 0)
+        flat = cell_ids[known] * n_values + codes[known]
+
+        matrix = np.bincount(
+            flat, minlength=n_cells * n_values).reshape(n_cells, n_values)
+        counts[col] = pd.DataFrame(matrix, index=cells.index,
+                                   columns=values.cat.categories.astype(str))
+
+    for col in DISTRIBUTIONS:
+        first, _, step = DISTRIBUTIONS[col]
+        grid = distribution_grid(col)
+        n_bins = len(grid) + 2
+
+        values = df[col].to_numpy(dtype="float64")
+        known = in_cell & ~np.isnan(values)
+        bins = np.clip(np.rint((values[known] - first) / step),
+                       -1, len(grid)).astype("int64") + 1
+        flat = cell_ids[known] * n_bins + bins
+
+        matrix = np.bincount(
+            flat, minlength=n_cells * n_bins).reshape(n_cells, n_bins)
+        counts[col] = pd.DataFrame(
+            matrix, index=cells.index,
+            columns=np.concatenate([[-np.inf], grid, [np.inf]]))
+
+    return cells, counts
+
+
+def merge_aggregates(left, right):
+    if left is None:
+        return right
+
+    cells = left[0].add(right[0], fill_value=0)
+    for col in DISTRIBUTIONS:
+        for extreme in ["min", "max"]:
+            both = pd.concat([left[0][f"{col}_{extreme}"],
+                              right[0][f"{col}_{extreme}"]], axis=1)
+            cells[f"{col}_{extreme}"] = getattr(both, extreme)(axis=1)
+
+    counts = {col: left[1][col].add(right[1][col], fill_value=0)
+              for col in left[1]}
+    return cells, counts
+
+
+def aggregate_csv(the_file_path, chunk_rows=CHUNK_ROWS):
+    # Only One Chunk Is Ever Held In Memory, Next To The Running Aggregates
+    aggregates = None
+    for chunk in pd.read_csv(the_file_path, chunksize=chunk_rows):
+        chunk = loader.prepare_frame(chunk)
+        aggregates = merge_aggregates(aggregates, aggregate(chunk))
+
+    return aggregates
+
+
+def from_frame(df, version=""):
+    return Cube(*aggregate(df), version)
+
+
+def from_csv(the_file_path, version="", chunk_rows=CHUNK_ROWS):
+    return Cube(*aggregate_csv(the_file_path, chunk_rows), version)
+
+
+class Cube:
+    """Pre-aggregated Category x Size x Location x Season cube.
+
+    ``cells`` holds one row per observed combination of the dimensions with
+    the row count and the sums of ``MEASURES``; ``counts[col]`` is a
+    cells x values matrix of value counts for each of ``COUNT_COLUMNS``,
+    and a cells x bins histogram for each of ``DISTRIBUTIONS``.
+    Filter selections are answered from a FilterIndex built over the cells,
+    so nothing here ever scans the raw rows again. ``version`` identifies
+    the dataset the cube was built from.
+
+    Build it with ``from_frame`` for a loaded dataset or ``from_csv`` to
+    stream a source file in chunks.
+    """
+
+    def __init__(self, cells, counts, version=""):
+        self.version = version
+
+        cells = cells.copy()
+        cells[INTEGER_COLUMNS] = cells[INTEGER_COLUMNS].astype("int64")
+        self.cells = cells.reset_index()
+
+        self.counts = {}
+        self.labels = {}
+
+        for col, table in counts.items():
+            table = table.reindex(index=cells.index, fill_value=0).fillna(0)
+            self.counts[col] = table.to_numpy(dtype="int64")
+            self.labels[col] = table.columns
+
+        self.index = FilterIndex(self.cells, DIMENSIONS)
+
+    def options(self, col):
+        return self.index.options(col)
+
+    def select(self, filters):
+        return CubeSlice(self, self.index.select(filters))
+
+
+class CubeSlice:
+    """The cube cells matching one filter selection.
+
+    A selection covering every cell works on the cube's own arrays rather
+    than copies of them, which is what most reruns ask for.
+    """
+
+    def __init__(self, cube, positions):
+        self.cube = cube
+        self.positions = positions
+        self.full = len(positions) == len(cube.cells)
+        self.cells = cube.cells if self.full else cube.cells.iloc[positions]
+        self._summaries = {}
+        self._totals = {}
+        self._summaries_lock = threading.Lock()
+
+    def column_counts(self, col):
+        if self.full:
+            return self.cube.counts[col]
+        return self.cube.counts[col][self.positions]
+
+    def column_totals(self, col):
+        # Summed Once Per Slice And Shared By Everything Asking About col
+        if col not in self._totals:
+            if self.full:
+                self._totals[col] = self.cube.counts[col].sum(axis=0)
+            else:
+                weights = np.zeros(len(self.cube.cells), dtype="int64")
+                weights[self.positions] = 1
+                self._totals[col] = weights @ self.cube.counts[col]
+        return self._totals[col]
+
+    def nbytes(self):
+        # Memory Held By This Slice Alone, The Cube Itself Is Shared
+        total = self.positions.nbytes
+        if not self.full:
+            total += int(self.cells.memory_usage(deep=True).sum())
+        total += sum(int(summary.memory_usage(deep=True).sum())
+                     for summary in self._summaries.values())
+        total += sum(totals.nbytes for totals in self._totals.values())
+        return total
+
+    def count(self):
+        return int(round(self.cells["count"].sum()))
+
+    def sum(self, measure):
+        return self.cells[measure].sum()
+
+    def mean(self, measure):
+        count = self.cells[MEASURE_COUNTS[measure]].sum()
+        return self.sum(measure) / count if count else np.nan
+
+    def sum_by(self, dim, measure="count"):
+        return self.cells.groupby(dim)[measure].sum()
+
+    def mean_by(self, dim, measure):
+        return (self.sum_by(dim, measure) /
+                self.sum_by(dim, MEASURE_COUNTS[measure])).rename(measure)
+
+    def value_counts(self, col):
+        if col in DIMENSIONS:
+            counts = self.sum_by(col)
+        else:
+            counts = pd.Series(self.column_totals(col),
+                               index=pd.Index(self.cube.labels[col], name=col))
+
+        counts = counts[counts > 0].sort_values(ascending=False, kind="stable")
+        return counts.rename("count")
+
+    def top_counts(self, col, n):
+        """The ``n`` most frequent values, as ``value_counts(col).nlargest(n)``.
+
+        Only the values that can make the cut get sorted: a partial sort of
+        the summed counts finds the n-th largest, and ties keep label order.
+        """
+        if col in DIMENSIONS:
+            return self.value_counts(col).nlargest(n)
+
+        totals = self.column_totals(col)
+        candidates = np.flatnonzero(totals)
+        if len(candidates) > n:
+            kth = len(candidates) - n
+            threshold = np.partition(totals[candidates], kth)[kth]
+            candidates = candidates[totals[candidates] >= threshold]
+
+        top = candidates[np.lexsort((candidates, -totals[candidates]))][:n]
+        return pd.Series(totals[top], name="count",
+                         index=pd.Index(self.cube.labels[col][top], name=col))
+
+    def histogram(self, col):
+        """Row counts per grid point of a ``DISTRIBUTIONS`` column.
+
+        Merged from the per-cell histograms, with only the points that
+        occur in the slice; rows past the grid are in ``out_of_range``.
+        """
+        counts = pd.Series(self.column_totals(col)[1:-1], name="count",
+                           index=pd.Index(distribution_grid(col), name=col))
+        return counts[counts > 0]
+
+    def out_of_range(self, col):
+        # Rows Below And Above The Grid
+        totals = self.column_totals(col)
+        return totals[0], totals[-1]
+
+    def percentiles(self, col, quantiles):
+        """Quantiles of a ``DISTRIBUTIONS`` column, as ``Series.quantile``.
+
+        Read off the merged histogram, so no row is ever sorted.
+        """
+        return distribution_quantiles(col, self.column_totals(col),
+                                      self.cells[f"{col}_min"].min(),
+                                      self.cells[f"{col}_max"].max(),
+                                      quantiles)
+
+    def nunique(self, col):
+        if col in DIMENSIONS:
+            return int((self.value_counts(col) > 0).sum())
+        return int(np.count_nonzero(self.column_totals(col)))
+
+    def crosstab(self, row, col):
+        if col in DIMENSIONS:
+            return self.cells.groupby([row, col])["count"].sum().unstack()
+
+        table = pd.DataFrame(self.column_counts(col),
+                             columns=pd.Index(self.cube.labels[col], name=col))
+        table = table.groupby(self.cells[row].to_numpy()).sum()
+        table.index.name = row
+
+        # Missing Combinations Stay Empty, Just Like An Unstacked Groupby
+        table = table.loc[:, table.sum() > 0]
+        return table.where(table > 0)
+
+    def summarize(self, dim, breakdowns):
+        """Every per-``dim`` aggregate a page needs, from one grouped pass.
+
+        The result has a ``totals`` column group holding the summed measures
+        and row count, plus one column group of value counts per breakdown
+        column. It is computed once per slice and reused by later callers.
+        """
+        key = (dim, tuple(breakdowns))
+
+        # Charts Built On Several Threads Share One Computation
+        with self._summaries_lock:
+            if key not in self._summaries:
+                self._summaries[key] = self._summarize(dim, breakdowns)
+            return self._summaries[key]
+
+    def _summarize(self, dim, breakdowns):
+        parts = {"totals": self.cells[MEASURES +
+                                      list(MEASURE_COUNTS.values()) +
+                                      ["count"]]}
+        for col in breakdowns:
+            if col in DIMENSIONS:
+                # Every Option Gets A Column, Even With No Cells Selected
+                parts[col] = pd.get_dummies(self.cells[col])\
+                    .reindex(columns=self.cube.options(col), fill_value=0)\
+                    .mul(self.cells["count"], axis=0)
+            else:
+                parts[col] = pd.DataFrame(self.column_counts(col),
+                                          index=self.cells.index,
+                                          columns=self.cube.labels[col])
+
+        table = pd.concat(parts, axis=1)
+        summary = table.groupby(self.cells[dim].to_numpy()).sum()
+        return summary.rename_axis(dim)
@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+import pickle
+
+import loader
+
+
+STORE_DIR = os.path.join(loader.CACHE_DIR, "store")
+
+# Total Size Kept On Disk, The Least Recently Used Entries Go First
+MAX_BYTES = 512 * 1024 * 1024
+
+# Evicting Brings The Store Down To This Share Of MAX_BYTES
+EVICT_TO = 0.9
+
+
+class DiskStore:
+    """Content-addressed blobs on disk, shared by every worker on a node.
+
+    A key is any JSON-serializable value that names its content, such as
+    ``("figure", chart, filters, dataset_version)``; its hash is the file
+    name. Writes go to a temporary file renamed into place, so readers in
+    other processes see a whole entry or none. Reads bump the file's
+    mtime, and once the store outgrows ``max_bytes`` the entries with the
+    oldest mtimes are deleted.
+    """
+
+    def __init__(self, directory=STORE_DIR, max_bytes=MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        # Bytes Written By This Process Since It Last Summed The Store
+        self._written = max_bytes
+
+    def path(self, key):
+        digest = hashlib.sha256(
+            json.dumps(key, default=str).encode()).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def get(self, key):
+        the_path = self.path(key)
+        try:
+            with open(the_path, "rb") as f:
+                data = f.read()
+            os.utime(the_path)
+        except OSError:
+            return None
+        return data
+
+    def put(self, key, data):
+        the_path = self.path(key)
+        os.makedirs(os.path.dirname(the_path), exist_ok=True)
+
+        def write(tmp_path):
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+
+        loader._write_atomic(the_path, write)
+
+        self._written += len(data)
+        if self._written > self.max_bytes * (1 - EVICT_TO):
+            self._written = 0
+            self.evict()
+
+    def get_object(self, key):
+        data = self.get(key)
+        return None if data is None else pickle.loads(data)
+
+    def put_object(self, key, value):
+        self.put(key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def evict(self):
+        entries = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(".tmp"):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size,
+                                os.path.join(root, name)))
+
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+
+        # Other Workers May Be Evicting Too, So Missing Files Are Fine
+        for _, size, the_path in sorted(entries):
+            try:
+                os.remove(the_path)
+            except OSError:
+                pass
+            total -= size
+            if total <= self.max_bytes * EVICT_TO:
+                break
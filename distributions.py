@@ -0,0 +1,109 @@
+# Importing Libraries
+import plotly.express as px
+import streamlit as st
+
+import cube
+
+
+# Percentiles Marked On Every Distribution Chart
+QUANTILES = [0.25, 0.5, 0.75, 0.9]
+
+
+def distributions_header():
+
+    st.title("Distributions :chart_with_upwards_trend:")
+
+
+def filter_data(source, category_filter, size_filter, location_filter,
+                season_filter):
+    filters = {"Category": category_filter, "Size": size_filter,
+               "Season": season_filter}
+    if location_filter != "ALL":
+        filters["Location"] = location_filter
+
+    return source.select(filters)
+
+
+def _median(the_slice, col):
+    return float(the_slice.percentiles(col, [0.5]).iloc[0])
+
+
+def median_age(the_slice):
+    return f"{_median(the_slice, 'Age'):,.0f}"
+
+
+def median_price(the_slice):
+    return f"{_median(the_slice, 'Price_in_USD'):,.0f}"
+
+
+def median_rating(the_slice):
+    return round(_median(the_slice, "Review_Rating"), 1)
+
+
+def _distribution_chart(the_slice, col, label, color, title):
+    # As A Frame, So An Empty Selection Still Gets An (Empty) Chart
+    histogram = the_slice.histogram(col).reset_index()
+    percentiles = the_slice.percentiles(col, QUANTILES).dropna()
+
+    fig = px.bar(histogram,
+                 x=col,
+                 y="count",
+                 color_discrete_sequence=[color],
+                 template="plotly_dark",
+                 labels={col: label, "count": "Customers"},
+                 title=title,
+                 )
+
+    # Rows Past The Grid Aren't Drawn, But Say How Many There Are
+    below, above = the_slice.out_of_range(col)
+    if below or above:
+        first, last, _ = cube.DISTRIBUTIONS[col]
+        fig.add_annotation(text=f"{below:,.0f} below {first:g}, "
+                                f"{above:,.0f} above {last:g}",
+                           xref="paper", yref="paper", x=1, y=1.08,
+                           showarrow=False)
+
+    for quantile, value in percentiles.items():
+        fig.add_vline(x=value,
+                      line_dash="dash",
+                      line_color="#fff",
+                      annotation_text=f"p{quantile * 100:.0f}",
+                      annotation_position="top")
+
+    fig.update_layout(
+        showlegend=False,
+        bargap=0.1,
+        title={
+            "font": {
+                "size": 20,
+                "family": "tahoma"
+            }
+        },
+        hoverlabel={
+            "bgcolor": "#222",
+            "font_size": 14,
+            "font_family": "tahoma"
+        }
+    )
+
+    fig.update_traces(
+        hovertemplate=label + ": %{x}<br>Customers: %{y}",
+    )
+
+    return fig
+
+
+def create_age_chart(the_slice):
+    return _distribution_chart(the_slice, "Age", "Age", "#00DFA2",
+                               "\t\tThe Distribution of Age")
+
+
+def create_price_chart(the_slice):
+    return _distribution_chart(the_slice, "Price_in_USD", "Price (USD)",
+                               "#FF0060", "\t\tThe Distribution of Price")
+
+
+def create_rating_chart(the_slice):
+    return _distribution_chart(the_slice, "Review_Rating", "Review Rating",
+                               "#0079FF",
+                               "\t\tThe Distribution of Review Rating")
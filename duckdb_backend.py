@@ -0,0 +1,274 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import loader
+import cube
+
+
+# Minimum Seconds Between Two Looks At The Source File
+REFRESH_SECONDS = 2.0
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _connect():
+    # Optional Dependency, Only Needed When This Backend Is Selected
+    try:
+        import duckdb
+    except ImportError as error:
+        raise ImportError("the duckdb backend needs the duckdb package "
+                          "(pip install duckdb)") from error
+    return duckdb.connect()
+
+
+def load_table(the_file_path):
+    """In-memory DuckDB connection holding the file as a ``rows`` table.
+
+    Columns get the same names and types as the pandas loader gives them;
+    everything is read as text first so Yes/No columns stay strings.
+    """
+    header = pd.read_csv(the_file_path, nrows=0).columns
+    columns = []
+    for raw in header:
+        name = loader.clean_column_name(raw)
+        if name in loader.NUMERIC_COLUMNS:
+            kind = "BIGINT"
+        elif name == "Review_Rating":
+            kind = "DOUBLE"
+        else:
+            kind = "VARCHAR"
+        columns.append(f"CAST({_quote(raw)} AS {kind}) AS {_quote(name)}")
+
+    source = the_file_path.replace("'", "''")
+    con = _connect()
+    con.execute(f"CREATE TABLE rows AS SELECT {', '.join(columns)} "
+                f"FROM read_csv('{source}', header=true, all_varchar=true)")
+    return con
+
+
+class DuckDBCube:
+    """Drop-in for Cube whose queries run as SQL over a DuckDB table.
+
+    Filters and aggregations are pushed down to DuckDB, so only the small
+    result tables cross into pandas; the slices answer the same calls as
+    a CubeSlice and return the same shapes.
+    """
+
+    def __init__(self, con, version=""):
+        self.con = con
+        self.version = version
+        self.labels = {}
+
+        for col in cube.DIMENSIONS + cube.COUNT_COLUMNS:
+            values = self.query(f"SELECT DISTINCT {_quote(col)} AS v "
+                                f"FROM rows WHERE v IS NOT NULL "
+                                f"ORDER BY v")["v"]
+            self.labels[col] = values.tolist()
+
+    def query(self, sql, params=()):
+        # A Cursor Per Query, DuckDB Connections Aren't Shared Across Threads
+        return self.con.cursor().execute(sql, list(params)).df()
+
+    def options(self, col):
+        return list(self.labels[col])
+
+    def select(self, filters):
+        return DuckDBSlice(self, filters)
+
+
+class DuckDBSlice:
+    """The rows of a DuckDBCube matching one filter selection."""
+
+    def __init__(self, the_cube, filters):
+        self.cube = the_cube
+        self._summaries = {}
+        self._summaries_lock = threading.Lock()
+
+        clauses = []
+        self.params = []
+        for col, values in filters.items():
+            if isinstance(values, str):
+                values = [values]
+            if set(the_cube.labels[col]).issubset(values):
+                continue
+            if not values:
+                clauses.append("FALSE")
+                continue
+
+            marks = ", ".join("?" for _ in values)
+            clauses.append(f"{_quote(col)} IN ({marks})")
+            self.params.extend(values)
+
+        self.where = " AND ".join(clauses) or "TRUE"
+
+    def _query(self, select, group_by=None, order_by=None, known=()):
+        # Rows Missing A Value In ``known`` Are Skipped, As pandas Skips NaN
+        sql = f"SELECT {select} FROM rows WHERE ({self.where})"
+        for col in known:
+            sql += f" AND {_quote(col)} IS NOT NULL"
+        if group_by:
+            sql += f" GROUP BY {group_by}"
+        if order_by:
+            sql += f" ORDER BY {order_by}"
+        return self.cube.query(sql, self.params)
+
+    @staticmethod
+    def _measure(measure):
+        if measure == "count":
+            return "COUNT(*)"
+        for column, known in cube.MEASURE_COUNTS.items():
+            if measure == known:
+                return f"COUNT({_quote(column)})"
+        if measure == "Review_Rating":
+            return f"COALESCE(SUM({_quote(measure)}), 0)"
+        return f"COALESCE(SUM({_quote(measure)}), 0)::BIGINT"
+
+    def nbytes(self):
+        # Only The Memoised Summaries Live In Python, The Rows Stay In DuckDB
+        return sum(int(summary.memory_usage(deep=True).sum())
+                   for summary in self._summaries.values())
+
+    def count(self):
+        return int(self._query("COUNT(*) AS n")["n"].iloc[0])
+
+    def sum(self, measure):
+        return self._query(f"{self._measure(measure)} AS s")["s"].iloc[0]
+
+    def mean(self, measure):
+        count = self.sum(cube.MEASURE_COUNTS[measure])
+        return self.sum(measure) / count if count else float("nan")
+
+    def sum_by(self, dim, measure="count"):
+        table = self._query(f"{_quote(dim)}, {self._measure(measure)} "
+                            f"AS {_quote(measure)}",
+                            group_by=_quote(dim), order_by=_quote(dim))
+        return table.set_index(dim)[measure]
+
+    def mean_by(self, dim, measure):
+        return (self.sum_by(dim, measure) /
+                self.sum_by(dim, cube.MEASURE_COUNTS[measure])).rename(measure)
+
+    def value_counts(self, col):
+        return self.top_counts(col, None)
+
+    def top_counts(self, col, n):
+        sql = (f"SELECT {_quote(col)}, COUNT(*) AS count FROM rows "
+               f"WHERE ({self.where}) AND {_quote(col)} IS NOT NULL "
+               f"GROUP BY {_quote(col)} ORDER BY count DESC, {_quote(col)}")
+        if n is not None:
+            sql += f" LIMIT {int(n)}"
+        return self.cube.query(sql, self.params).set_index(col)["count"]
+
+    def _distribution(self, col):
+        # Binned Like The Cube's Histograms, So Both Backends Agree
+        first, _, step = cube.DISTRIBUTIONS[col]
+        n_points = len(cube.distribution_grid(col))
+        column = _quote(col)
+        bins = (f"LEAST(GREATEST(ROUND_EVEN(({column} - {first}) / {step}, 0), "
+                f"-1), {n_points})::BIGINT + 1")
+
+        sql = (f"SELECT {bins} AS bin, COUNT(*) AS count, "
+               f"MIN({column}) AS lowest, MAX({column}) AS highest "
+               f"FROM rows WHERE ({self.where}) AND {column} IS NOT NULL "
+               f"GROUP BY bin")
+        table = self.cube.query(sql, self.params)
+
+        counts = np.zeros(n_points + 2, dtype="int64")
+        counts[table["bin"].to_numpy("int64")] = table["count"].to_numpy()
+        return counts, table["lowest"].min(), table["highest"].max()
+
+    def histogram(self, col):
+        counts = pd.Series(self._distribution(col)[0][1:-1], name="count",
+                           index=pd.Index(cube.distribution_grid(col),
+                                          name=col))
+        return counts[counts > 0]
+
+    def out_of_range(self, col):
+        counts = self._distribution(col)[0]
+        return counts[0], counts[-1]
+
+    def percentiles(self, col, quantiles):
+        counts, lowest, highest = self._distribution(col)
+        return cube.distribution_quantiles(col, counts, lowest, highest,
+                                           quantiles)
+
+    def nunique(self, col):
+        return int(self._query(f"COUNT(DISTINCT {_quote(col)}) AS n")["n"]
+                   .iloc[0])
+
+    def crosstab(self, row, col):
+        table = self._query(f"{_quote(row)}, {_quote(col)}, COUNT(*) AS n",
+                            group_by=f"{_quote(row)}, {_quote(col)}",
+                            known=[row, col])
+        return table.set_index([row, col])["n"].unstack().sort_index()
+
+    def summarize(self, dim, breakdowns):
+        """Per-``dim`` totals and value counts, shaped like CubeSlice's."""
+        key = (dim, tuple(breakdowns))
+        with self._summaries_lock:
+            if key not in self._summaries:
+                self._summaries[key] = self._summarize(dim, breakdowns)
+            return self._summaries[key]
+
+    def _summarize(self, dim, breakdowns):
+        totals = ", ".join(f"{self._measure(measure)} AS {_quote(measure)}"
+                           for measure in cube.MEASURES +
+                           list(cube.MEASURE_COUNTS.values()) + ["count"])
+        parts = {"totals": self._query(f"{_quote(dim)}, {totals}",
+                                       group_by=_quote(dim),
+                                       order_by=_quote(dim)).set_index(dim)}
+
+        for col in breakdowns:
+            # Every Value Gets A Column, Even With No Rows Selected
+            table = self.crosstab(dim, col).fillna(0).astype("int64")\
+                .reindex(columns=self.cube.labels[col], fill_value=0)
+            table.columns.name = None
+            parts[col] = table.reindex(parts["totals"].index, fill_value=0)
+
+        return pd.concat(parts, axis=1).rename_axis(dim)
+
+
+class DuckDBDataset:
+    """Keeps a DuckDBCube in step with its source file.
+
+    ``refresh`` reloads the table into a fresh connection when the file
+    changes and swaps in a new cube; readers keep the one they grabbed.
+    """
+
+    def __init__(self, the_file_path):
+        self.the_file_path = the_file_path
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self.reload()
+
+    def reload(self):
+        self.fingerprint = loader.file_fingerprint(self.the_file_path)
+        con = load_table(self.the_file_path)
+        self.cube = DuckDBCube(con, loader.dataset_version(self.the_file_path))
+
+    @property
+    def version(self):
+        return self.cube.version
+
+    def refresh(self, min_interval=REFRESH_SECONDS):
+        now = time.monotonic()
+        if now - self._checked_at < min_interval:
+            return False
+
+        # Another Session Is Already Looking, Serve What We Have
+        if not self._lock.acquire(blocking=False):
+            return False
+
+        try:
+            self._checked_at = now
+            if loader.file_fingerprint(self.the_file_path) == self.fingerprint:
+                return False
+            self.reload()
+            return True
+        finally:
+            self._lock.release()
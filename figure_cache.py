@@ -0,0 +1,176 @@
+import copy
+import json
+import threading
+from collections import OrderedDict
+
+import plotly.io as pio
+
+
+def normalize_filters(filters):
+    # Multiselect Order Doesn't Change The Figure, So It Mustn't Change The Key
+    return tuple(value if isinstance(value, str) else tuple(sorted(value))
+                 for value in filters)
+
+
+def figure_key(name, filters, version):
+    return (name, normalize_filters(filters), version)
+
+
+# Template Layout Sections Only Used By Traces Of These Types
+SUBPLOT_TYPES = {
+    "geo": {"scattergeo", "choropleth"},
+    "mapbox": {"scattermapbox", "choroplethmapbox", "densitymapbox"},
+    "polar": {"scatterpolar", "scatterpolargl", "barpolar"},
+    "ternary": {"scatterternary"},
+    "scene": {"scatter3d", "surface", "mesh3d", "cone", "streamtube",
+              "volume", "isosurface"},
+}
+
+# Trace Styles That Plotly Express Figures Often Repeat On Every Trace
+STYLE_KEYS = ["hovertemplate", "textfont", "textposition", "texttemplate",
+              "textinfo", "opacity", "marker", "hoverlabel"]
+
+
+def _merge(base, override):
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            value = _merge(merged[key], value)
+        merged[key] = value
+    return merged
+
+
+def compact_json(fig):
+    """Figure JSON with its template cut down to what the figure uses.
+
+    Trace styles for types the figure doesn't draw and layout sections for
+    subplots it doesn't have are dropped from the template, and a style
+    every trace of one type repeats moves into that type's template entry
+    so it is sent once. The figure renders the same as ``fig.to_json()``.
+    """
+    spec = json.loads(fig.to_json())
+    template = spec.get("layout", {}).get("template")
+    if not template:
+        return json.dumps(spec, separators=(",", ":"))
+
+    template = copy.deepcopy(template)
+    types = {trace.get("type", "scatter") for trace in spec["data"]}
+
+    data = {name: styles for name, styles in template.get("data", {}).items()
+            if name in types}
+    for name, used_by in SUBPLOT_TYPES.items():
+        if not types & used_by:
+            template.get("layout", {}).pop(name, None)
+
+    for name in types:
+        traces = [trace for trace in spec["data"]
+                  if trace.get("type", "scatter") == name]
+        styles = data.get(name, [{"type": name}])
+
+        # A Longer Style List Cycles Over The Traces, So Leave Those Alone
+        if len(traces) < 2 or len(styles) != 1:
+            continue
+
+        shared = {key: traces[0][key] for key in STYLE_KEYS
+                  if key in traces[0] and
+                  all(trace.get(key) == traces[0][key] for trace in traces)}
+        if not shared:
+            continue
+
+        data[name] = [_merge(styles[0], shared)]
+        for trace in traces:
+            for key in shared:
+                del trace[key]
+
+    template["data"] = data
+    spec["layout"]["template"] = template
+    return json.dumps(spec, separators=(",", ":"))
+
+
+class FigureCache:
+    """Size-bounded LRU of serialized Plotly figures shared by all sessions.
+
+    Entries are keyed by (chart name, normalized filters, dataset version)
+    and stored as figure JSON, so a hit never re-runs Plotly Express. With
+    a DiskStore, figures also outlive the process: a memory miss is looked
+    up there before the chart is rebuilt.
+    """
+
+    def __init__(self, max_entries=512, max_bytes=64 * 1024 * 1024,
+                 store=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.store = store
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.n_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Payload Size Of The Latest Build Of Each Chart
+        self.payload_bytes = {}
+
+    def get(self, key):
+        with self._lock:
+            fig_json = self._entries.get(key)
+            if fig_json is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return fig_json
+
+    def put(self, key, fig_json):
+        with self._lock:
+            if key in self._entries:
+                self.n_bytes -= len(self._entries.pop(key))
+
+            self._entries[key] = fig_json
+            self.n_bytes += len(fig_json)
+
+            while self._entries and (len(self._entries) > self.max_entries or
+                                     self.n_bytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self.n_bytes -= len(evicted)
+                self.evictions += 1
+
+    def figure(self, create, the_slice, filters, version):
+        key = figure_key(create.__module__ + "." + create.__name__,
+                         filters, version)
+
+        fig_json = self.get(key)
+        if fig_json is not None:
+            return pio.from_json(fig_json)
+
+        if self.store is not None:
+            data = self.store.get(("figure",) + key)
+            if data is not None:
+                fig_json = data.decode()
+                self.put(key, fig_json)
+                return pio.from_json(fig_json)
+
+        fig = create(the_slice)
+        fig_json = compact_json(fig)
+        self.put(key, fig_json)
+        if self.store is not None:
+            self.store.put(("figure",) + key, fig_json.encode())
+
+        with self._lock:
+            self.payload_bytes[key[0]] = len(fig_json)
+        return pio.from_json(fig_json)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.n_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "payload_bytes": dict(self.payload_bytes),
+            }
@@ -0,0 +1,62 @@
+import numpy as np
+
+
+# Columns The Sidebar Can Filter On
+FILTER_COLUMNS = ["Category", "Size", "Location", "Season"]
+
+
+class FilterIndex:
+    """Packed per-value bitmaps over the sidebar filter columns.
+
+    Built once per dataset; a filter selection is answered by OR-ing the
+    bitmaps of the selected values of each column and AND-ing the columns,
+    which gives the matching row positions without touching the strings.
+    """
+
+    def __init__(self, df, columns=FILTER_COLUMNS):
+        self.n_rows = len(df)
+        self.bitmaps = {}
+        self.option_lists = {}
+
+        for col in columns:
+            values = df[col].astype("category")
+            codes = values.cat.codes.to_numpy()
+
+            self.bitmaps[col] = {
+                value: np.packbits(codes == code)
+                for code, value in enumerate(values.cat.categories)
+            }
+            self.option_lists[col] = sorted(self.bitmaps[col])
+
+    def options(self, col):
+        # Sorted Once At Build Time, Callers Get Their Own Copy To Extend
+        return list(self.option_lists[col])
+
+    def column_bitmap(self, col, values):
+        bitmap = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        for value in values:
+            if value in self.bitmaps[col]:
+                bitmap |= self.bitmaps[col][value]
+        return bitmap
+
+    def select(self, filters):
+        """Return the row positions matching ``{column: values}``.
+
+        A single value may be passed instead of a list, and columns whose
+        selection covers every value are skipped.
+        """
+        selected = None
+
+        for col, values in filters.items():
+            if isinstance(values, str):
+                values = [values]
+            if set(self.bitmaps[col]).issubset(values):
+                continue
+
+            bitmap = self.column_bitmap(col, values)
+            selected = bitmap if selected is None else selected & bitmap
+
+        if selected is None:
+            return np.arange(self.n_rows)
+        return np.flatnonzero(np.unpackbits(selected, count=self.n_rows))
+
@@ -0,0 +1,35 @@
+import streamlit as st
+
+
+# Sidebar Widgets: (column, label, single choice with an "ALL" option)
+CATEGORY = ("Category", "Select The Category 👕💎", False)
+SIZE = ("Size", "Select The Size 👔", False)
+LOCATION = ("Location", "Select The Location 🌏", True)
+SEASON = ("Season", "Select The Season :snowflake::sunny:", False)
+
+
+def filter_panel(the_cube, *widgets):
+    """Sidebar form holding a page's filter widgets, applied in one go.
+
+    Edits don't rerun the app until "Apply Filters" is pressed, so a
+    burst of clicks costs a single rerun; until then the widgets keep
+    returning the last applied selection. Pages with the same widgets
+    share one form and so keep the selection when switching between
+    them. Options come straight from the cube, which sorts them once.
+    """
+    key = "filters_" + "_".join(col for col, _, _ in widgets)
+
+    values = []
+    with st.form(key):
+        for col, label, single in widgets:
+            options = the_cube.options(col)
+            if single:
+                values.append(st.selectbox(label, options=["ALL"] + options,
+                                           index=0))
+            else:
+                values.append(st.multiselect(label, options=options,
+                                             default=options))
+
+        st.form_submit_button("Apply Filters")
+
+    return tuple(values)
@@ -1,8 +1,7 @@
-import pandas as pd
-import numpy as np
 import plotly.express as px
 import streamlit as st
-from streamlit.components.v1 import html
+
+import labels
 
 
 def home_header():
@@ -10,43 +9,38 @@ def home_header():
     st.title('Shopping Trends Dashboard :bar_chart:')
 
 
-def filter_data(df, category_filter, size_filter, location_filter):
-    if location_filter == "ALL":
-        filt = (df["Category"].isin(category_filter)) &\
-            (df["Size"].isin(size_filter))
-
-    else:
-        filt = (df["Category"].isin(category_filter)) &\
-            (df["Size"].isin(size_filter)) &\
-            (df["Location"] == location_filter)
+def filter_data(source, category_filter, size_filter, location_filter):
+    filters = {"Category": category_filter, "Size": size_filter}
+    if location_filter != "ALL":
+        filters["Location"] = location_filter
 
-    return df[filt]
+    return source.select(filters)
 
 
-def total_customers(the_df):
-    return f"{len(the_df):,.0f}"
+def total_customers(the_slice):
+    return f"{the_slice.count():,.0f}"
 
 
-def avergae_rating(the_df):
-    return round(the_df["Review_Rating"].mean(), 1)
+def avergae_rating(the_slice):
+    return round(the_slice.mean("Review_Rating"), 1)
 
 
-def total_purchases(the_df):
-    return f"{the_df['Previous_Purchases'].sum():,.0f}"
+def total_purchases(the_slice):
+    return f"{the_slice.sum('Previous_Purchases'):,.0f}"
 
 
-def create_category_chart(the_df):
-    category = the_df["Category"].value_counts()
+def create_category_chart(the_slice):
+    category = the_slice.value_counts("Category")
+    popularity = labels.shares(category)
 
     fig = px.bar(category,
                  x=category.index,
-                 y=(category / sum(category)) * 100,
+                 y=popularity,
                  color=category.index,
                  color_discrete_sequence=["#FF0060",
                                           "#00DFA2", "#0079FF", "#F6FA70"],
                  template="plotly_dark",
-                 text=category.apply(
-                     lambda x: f"{ (x / sum(category)) * 100:0.0f}%"),
+                 text=labels.percent_labels(popularity),
                  labels={"index": "Category",  "y": "Popularity (%)"},
                  title="\t\tThe Popularity of Each Category",
                  width=500
@@ -78,8 +72,8 @@ def create_category_chart(the_df):
     return fig
 
 
-def create_gender_chart(the_df):
-    gender = the_df["Gender"].value_counts()
+def create_gender_chart(the_slice):
+    gender = the_slice.value_counts("Gender")
     fig = px.pie(names=gender.index,
                  values=gender,
                  color_discrete_sequence=["#FF0060", "#03C988"],
@@ -119,8 +113,8 @@ def create_gender_chart(the_df):
     return fig
 
 
-def create_shipping_chart(the_df):
-    dfshipping_type = the_df["Shipping_Type"].value_counts()
+def create_shipping_chart(the_slice):
+    dfshipping_type = the_slice.value_counts("Shipping_Type")
     fig = px.scatter(dfshipping_type,
                      size=dfshipping_type,
                      color=dfshipping_type.index,
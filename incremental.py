@@ -0,0 +1,241 @@
+import hashlib
+import io
+import os
+import threading
+import time
+
+import pandas as pd
+
+import loader
+import cube
+import sampling
+
+
+# Minimum Seconds Between Two Looks At The Source File
+REFRESH_SECONDS = 2.0
+
+# Bytes Just Before The Read Offset, Used To Tell An Append From A Rewrite
+CHECK_BYTES = 64 * 1024
+
+# Characters Of The Content Digest Kept In The Version
+VERSION_CHARS = 12
+
+
+class _Window(io.RawIOBase):
+    """Read-only view of ``length`` bytes of an open file.
+
+    Every byte read is also fed to ``digest``, if given.
+    """
+
+    def __init__(self, f, length, digest=None):
+        self.f = f
+        self.remaining = length
+        self.digest = digest
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.f.read(min(len(buffer), self.remaining))
+        buffer[:len(data)] = data
+        self.remaining -= len(data)
+        if self.digest is not None:
+            self.digest.update(data)
+        return len(data)
+
+
+def _last_line_end(f, start, end):
+    # Position Just After The Last Newline In [start, end), Or start If None
+    position = end
+    while position > start:
+        step = min(CHECK_BYTES, position - start)
+        f.seek(position - step)
+        newline = f.read(step).rfind(b"\n")
+        if newline >= 0:
+            return position - step + newline + 1
+        position -= step
+    return start
+
+
+def _tail_hash(the_file_path, end):
+    start = max(0, end - CHECK_BYTES)
+    with open(the_file_path, "rb") as f:
+        f.seek(start)
+        return hashlib.sha256(f.read(end - start)).hexdigest()
+
+
+def _prefix_digest(the_file_path, end, block_size=1 << 20):
+    # Running Hash Of The First ``end`` Bytes, Carried On As Rows Are Appended
+    digest = hashlib.sha256()
+    with open(the_file_path, "rb") as f:
+        window = _Window(f, end, digest)
+        while window.read(block_size):
+            pass
+    return digest
+
+
+class IncrementalDataset:
+    """Keeps the cube in step with an append-only CSV.
+
+    ``refresh`` parses only the bytes appended since the last look, merges
+    their aggregates into the running ones and swaps in a cube whose version
+    is a hash of the bytes read so far, so cached figures of older data stop
+    matching, and processes that read the same bytes agree on it however
+    many appends they saw them in. The byte offset alone tells new rows
+    from old ones, so a returning customer's purchases count like any
+    other. A shrunk or rewritten file triggers a full reload.
+
+    In chunked mode the file is streamed into the cube; otherwise the
+    initial aggregates come from the typed frame (memory-mapped from the
+    loader's columnar cache), which is let go once the cube is built.
+
+    With ``approximate`` the cube starts out as a SampleCube estimated
+    from a sample of the file, and the exact one replaces it once a
+    background load finishes. With a DiskStore the aggregates of a full
+    load are saved there and restored by later loads of the same file.
+    """
+
+    def __init__(self, the_file_path, chunked=False,
+                 chunk_rows=cube.CHUNK_ROWS, approximate=False, store=None):
+        self.the_file_path = the_file_path
+        self.chunked = chunked
+        self.chunk_rows = chunk_rows
+        self.store = store
+
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+
+        if approximate:
+            # Held Until The Exact Load Is Done, So Refresh Waits For It
+            self._lock.acquire()
+            self.cube = sampling.sample_cube(the_file_path)
+            threading.Thread(target=self._load_exact, daemon=True).start()
+        else:
+            self.reload()
+
+    def _load_exact(self):
+        try:
+            self.reload()
+        finally:
+            self._lock.release()
+
+    def reload(self):
+        with open(self.the_file_path, "rb") as f:
+            header = f.readline()
+
+        self.columns = pd.read_csv(io.BytesIO(header)).columns.tolist()
+        self.aggregates = None
+
+        # Hashed First, Stored Aggregates Of The Same Bytes Spare Us The Parse
+        size = os.path.getsize(self.the_file_path)
+        self.digest = _prefix_digest(self.the_file_path, size)
+        if self.chunked:
+            if not self._restore():
+                self._read_from_start(len(header), size)
+        else:
+            df = loader.load_dataset(self.the_file_path)
+            if not self._restore():
+                if os.path.getsize(self.the_file_path) == size:
+                    self._add_rows(df)
+                    self._save()
+                else:
+                    # Rows Appended Mid-Load May Be In The Frame, So Only
+                    # The Bytes Up To The Size Taken Before It Are Counted
+                    self._read_from_start(len(header), size)
+
+            # The Pages Are Served From The Cube, The Rows Aren't Kept
+            del df
+
+        self.offset = size
+        self.tail = _tail_hash(self.the_file_path, self.offset)
+        self._publish()
+
+    def _read_from_start(self, start, size):
+        # The Digest Already Covers These Bytes
+        self.offset = start
+        self._read_appended(size, whole_lines=False, hashed=True)
+        self._save()
+
+    @property
+    def version(self):
+        return f"{self.digest.hexdigest()[:VERSION_CHARS]}.{self.offset}"
+
+    def _store_key(self):
+        # Aggregates Saved Before A Column Was Added Don't Match Any More
+        return ("cube_aggregates", self.digest.hexdigest(),
+                sorted(cube.MEASURE_COUNTS.items()),
+                cube.COUNT_COLUMNS, sorted(cube.DISTRIBUTIONS.items()))
+
+    def _restore(self):
+        if self.store is None:
+            return False
+
+        stored = self.store.get_object(self._store_key())
+        if stored is None:
+            return False
+
+        self.aggregates = stored
+        return True
+
+    def _save(self):
+        if self.store is not None and self.aggregates is not None:
+            self.store.put_object(self._store_key(), self.aggregates)
+
+    def refresh(self, min_interval=REFRESH_SECONDS):
+        now = time.monotonic()
+        if now - self._checked_at < min_interval:
+            return False
+
+        # Another Session Is Already Looking, Serve What We Have
+        if not self._lock.acquire(blocking=False):
+            return False
+
+        try:
+            self._checked_at = now
+            size = os.path.getsize(self.the_file_path)
+            if size == self.offset:
+                return False
+
+            if (size < self.offset or
+                    _tail_hash(self.the_file_path, self.offset) != self.tail):
+                self.reload()
+                return True
+
+            if not self._read_appended(size):
+                return False
+
+            self._publish()
+            return True
+        finally:
+            self._lock.release()
+
+    def _read_appended(self, size, whole_lines=True, hashed=False):
+        with open(self.the_file_path, "rb") as f:
+            # A Line Still Being Written Is Left For The Next Refresh
+            end = _last_line_end(f, self.offset, size) if whole_lines else size
+            if end == self.offset:
+                return False
+
+            f.seek(self.offset)
+            window = io.BufferedReader(_Window(
+                f, end - self.offset, None if hashed else self.digest))
+            added = False
+            for chunk in pd.read_csv(window, names=self.columns, header=None,
+                                     chunksize=self.chunk_rows):
+                added = self._add_rows(loader.prepare_frame(chunk)) or added
+
+        self.offset = end
+        self.tail = _tail_hash(self.the_file_path, end)
+        return added
+
+    def _add_rows(self, delta):
+        if delta.empty:
+            return False
+
+        self.aggregates = cube.merge_aggregates(self.aggregates,
+                                                cube.aggregate(delta))
+        return True
+
+    def _publish(self):
+        # Readers Keep Whichever Cube They Grabbed, The Swap Is Atomic
+        self.cube = cube.Cube(*self.aggregates, self.version)
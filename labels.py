@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+
+def shares(counts):
+    # Percent Of The Total, With The Total Summed Once For All Bars
+    return (counts / counts.sum()) * 100
+
+
+def percent_labels(percents, decimals=0):
+    """Text labels like "12%" for a Series of percentages, in one pass.
+
+    The strings are the same as formatting each value with
+    ``f"{x:0.{decimals}f}%"``; whole percents are rounded with np.rint,
+    which breaks ties to even just like float formatting does.
+    """
+    values = percents.to_numpy(dtype="float64")
+    if decimals == 0:
+        text = np.rint(values).astype("int64").astype(str)
+        text = np.char.add(text, "%")
+    else:
+        text = np.char.mod(f"%.{decimals}f%%", values)
+
+    return pd.Series(text, index=percents.index, name=percents.name,
+                     dtype=object)
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+import pyarrow.feather as feather
+
+
+# Where The Columnar Copy Of The Dataset Lives (Uncompressed Arrow IPC, So
+# It Can Be Memory-Mapped And Used In Place)
+CACHE_DIR = ".cache"
+
+# Columns Stored As Pandas Categoricals
+CATEGORY_COLUMNS = [
+    "Gender", "Item_Purchased", "Category", "Location", "Size", "Color",
+    "Season", "Subscription_Status", "Shipping_Type", "Discount_Applied",
+    "Promo_Code_Used", "Payment_Method", "Frequency_of_Purchases",
+]
+
+# Numeric Columns And How Far They Can Be Narrowed
+# (Review_Rating stays float64 so averages match the raw CSV exactly)
+NUMERIC_COLUMNS = {
+    "Customer_ID": "integer",
+    "Age": "integer",
+    "Price_in_USD": "integer",
+    "Previous_Purchases": "integer",
+}
+
+
+def clean_column_name(the_name):
+    the_name = the_name.replace(" ", "_")
+    if the_name == "Purchase_Amount_(USD)":
+        return "Price_in_USD"
+    return the_name
+
+
+def parse_csv(the_file_path, **read_csv_kwargs):
+    header = pd.read_csv(the_file_path, nrows=0).columns
+    dtypes = {raw: "category" for raw in header
+              if clean_column_name(raw) in CATEGORY_COLUMNS}
+
+    df = pd.read_csv(the_file_path, dtype=dtypes, **read_csv_kwargs)
+    return prepare_frame(df)
+
+
+def prepare_frame(df):
+    df.columns = [clean_column_name(col) for col in df.columns]
+
+    for col, kind in NUMERIC_COLUMNS.items():
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], downcast=kind)
+
+    df.set_index("Customer_ID", inplace=True)
+    return df
+
+
+def file_fingerprint(the_file_path):
+    stat = os.stat(the_file_path)
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def file_hash(the_file_path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(the_file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_paths(the_file_path, cache_dir=CACHE_DIR):
+    stem = os.path.splitext(os.path.basename(the_file_path))[0]
+    return (os.path.join(cache_dir, f"{stem}.feather"),
+            os.path.join(cache_dir, f"{stem}.json"))
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_atomic(the_path, write):
+    tmp_path = f"{the_path}.{os.getpid()}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, the_path)
+
+
+def _write_meta(meta_path, meta):
+    def write(tmp_path):
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+
+    _write_atomic(meta_path, write)
+
+
+def cache_is_fresh(the_file_path, cache_dir=CACHE_DIR):
+    columns_path, meta_path = cache_paths(the_file_path, cache_dir)
+    meta = _read_meta(meta_path)
+    if meta is None or not os.path.exists(columns_path):
+        return False
+
+    fingerprint = file_fingerprint(the_file_path)
+    if all(meta.get(key) == value for key, value in fingerprint.items()):
+        return True
+
+    # The File Was Touched, Only Rebuild If Its Content Really Changed
+    if meta.get("sha256") != file_hash(the_file_path):
+        return False
+
+    meta.update(fingerprint)
+    _write_meta(meta_path, meta)
+    return True
+
+
+def build_cache(the_file_path, cache_dir=CACHE_DIR):
+    columns_path, meta_path = cache_paths(the_file_path, cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    meta = file_fingerprint(the_file_path)
+    meta["sha256"] = file_hash(the_file_path)
+
+    df = parse_csv(the_file_path)
+    _write_atomic(columns_path, lambda tmp_path: df.to_feather(
+        tmp_path, compression="uncompressed"))
+    _write_meta(meta_path, meta)
+    return df
+
+
+# Function To Load Our Dataset Through The Typed Columnar Cache
+def load_dataset(the_file_path, cache_dir=CACHE_DIR):
+    if not cache_is_fresh(the_file_path, cache_dir):
+        return build_cache(the_file_path, cache_dir)
+
+    # Every Column Is A Read-Only View Of The Mapped File, Not A Decoded Copy,
+    # So Workers Reading The Same Cache Share Its Pages
+    columns_path, _ = cache_paths(the_file_path, cache_dir)
+    table = feather.read_table(columns_path, memory_map=True)
+    return table.to_pandas(split_blocks=True)
+
+
+def dataset_version(the_file_path, cache_dir=CACHE_DIR):
+    _, meta_path = cache_paths(the_file_path, cache_dir)
+    meta = _read_meta(meta_path) or {}
+    fingerprint = file_fingerprint(the_file_path)
+
+    # No Up-To-Date Columnar Cache (e.g. Chunked Ingestion), Hash The Source
+    if "sha256" not in meta or any(meta.get(key) != value
+                                   for key, value in fingerprint.items()):
+        return file_hash(the_file_path)[:12]
+    return meta["sha256"][:12]
@@ -0,0 +1,205 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import threading
+import time
+import warnings
+
+import numpy as np
+import streamlit as st
+import streamlit_option_menu
+from streamlit.testing.v1 import AppTest
+
+import bench
+
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_FILE = os.path.join(APP_DIR, "app.py")
+
+PAGES = ["Home", "Products", "Locations", "Distributions"]
+
+# Session State Key The Patched Sidebar Menu Reads The Page From
+PAGE_KEY = "loadtest_page"
+
+# Share Of A Session's Steps That Switch Page Instead Of Changing Filters
+SWITCH_SHARE = 0.3
+
+
+def patch_menu():
+    # AppTest Can't Click The Custom Sidebar Component, So Sessions Pick
+    # Their Page Through Session State Instead
+    def option_menu(menu_title, options, **kwargs):
+        return st.session_state.get(PAGE_KEY, options[0])
+
+    streamlit_option_menu.option_menu = option_menu
+
+
+def random_filters(at, rng):
+    for widget in at.multiselect:
+        size = rng.integers(1, len(widget.options) + 1)
+        widget.set_value(
+            sorted(rng.choice(widget.options, size, replace=False).tolist()))
+
+    for widget in at.selectbox:
+        widget.set_value(str(rng.choice(widget.options)))
+
+    # The Filters Only Apply When The Form Is Submitted
+    at.button[0].click()
+
+
+def timed_run(at, page, samples, errors):
+    started = time.perf_counter()
+    at.run()
+    samples.append((page, time.perf_counter() - started))
+
+    if at.exception:
+        errors.append((page, at.exception[0].value))
+
+
+def run_session(session_id, n_steps, seed, timeout, samples, errors):
+    rng = np.random.default_rng([seed, session_id])
+    at = AppTest.from_file(APP_FILE, default_timeout=timeout)
+
+    page = str(rng.choice(PAGES))
+    at.session_state[PAGE_KEY] = page
+    timed_run(at, page, samples, errors)
+
+    for _ in range(n_steps):
+        if rng.random() < SWITCH_SHARE:
+            page = str(rng.choice(PAGES))
+            at.session_state[PAGE_KEY] = page
+        else:
+            random_filters(at, rng)
+        timed_run(at, page, samples, errors)
+
+
+def latency_stats(seconds):
+    seconds = np.asarray(seconds)
+    return {
+        "reruns": len(seconds),
+        "mean": round(float(seconds.mean()), 6),
+        "p50": round(float(np.percentile(seconds, 50)), 6),
+        "p90": round(float(np.percentile(seconds, 90)), 6),
+        "p99": round(float(np.percentile(seconds, 99)), 6),
+        "max": round(float(seconds.max()), 6),
+    }
+
+
+def current_rss():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize()
+
+
+def run_load(n_sessions, n_steps, seed=0, timeout=120):
+    """Drive ``n_sessions`` concurrent sessions and report rerun latency.
+
+    Every session runs on its own thread, like Streamlit serves sessions
+    inside one worker, and shares the process-wide caches with the others.
+    One untimed session warms the worker up first.
+    """
+    AppTest.from_file(APP_FILE, default_timeout=timeout).run()
+
+    samples = []
+    errors = []
+    threads = [threading.Thread(target=run_session,
+                                args=(session_id, n_steps, seed, timeout,
+                                      samples, errors))
+               for session_id in range(n_sessions)]
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    started = time.perf_counter()
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    seconds = time.perf_counter() - started
+    after = resource.getrusage(resource.RUSAGE_SELF)
+    cpu_seconds = (after.ru_utime - usage.ru_utime +
+                   after.ru_stime - usage.ru_stime)
+
+    pages = {}
+    for page, elapsed in samples:
+        pages.setdefault(page, []).append(elapsed)
+
+    return {
+        "sessions": n_sessions,
+        "steps": n_steps,
+        "seconds": round(seconds, 6),
+        "reruns_per_second": round(len(samples) / seconds, 3),
+        "cpu_seconds": round(cpu_seconds, 6),
+        "cpu_utilization": round(cpu_seconds / seconds, 3),
+        "rss_bytes": current_rss(),
+        "peak_rss_bytes": after.ru_maxrss * 1024,
+        "errors": [f"{page}: {message}" for page, message in errors],
+        "all": latency_stats([elapsed for _, elapsed in samples]),
+        "pages": {page: latency_stats(pages[page]) for page in sorted(pages)},
+    }
+
+
+def prepare_dataset(n_rows, work_dir, seed):
+    # The App Reads Its Files Relative To The Working Directory, So A
+    # Synthetic Dataset Gets A Directory Of Its Own Next To Links To The Rest
+    for name in ["data", "imgs"]:
+        os.symlink(os.path.join(APP_DIR, name), os.path.join(work_dir, name))
+
+    bench.synthesize(n_rows, os.path.join(work_dir, bench.SOURCE_FILE), seed,
+                     source=os.path.join(APP_DIR, bench.SOURCE_FILE))
+    os.chdir(work_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load-test the dashboard with concurrent headless sessions.")
+    parser.add_argument("--sessions", type=int, default=8,
+                        help="concurrent sessions")
+    parser.add_argument("--steps", type=int, default=20,
+                        help="filter changes or page switches per session")
+    parser.add_argument("--rows", type=int,
+                        help="synthesize a dataset of this size instead of "
+                             "using the bundled one")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=120,
+                        help="seconds a single rerun may take")
+    parser.add_argument("--max-p99", type=float,
+                        help="exit with status 1 if any page's p99 rerun "
+                             "latency exceeds this many seconds")
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args()
+
+    warnings.simplefilter(action='ignore', category=FutureWarning)
+    patch_menu()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        if args.rows:
+            prepare_dataset(args.rows, work_dir, args.seed)
+        else:
+            os.chdir(APP_DIR)
+
+        report = run_load(args.sessions, args.steps, args.seed, args.timeout)
+        os.chdir(APP_DIR)
+
+    report["python"] = platform.python_version()
+    report["rows"] = args.rows
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+
+    # Usable As A Deploy Gate
+    failed = bool(report["errors"])
+    if args.max_p99 is not None:
+        failed = failed or any(stats["p99"] > args.max_p99
+                               for stats in report["pages"].values())
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
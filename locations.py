@@ -1,8 +1,6 @@
 import pandas as pd
-import numpy as np
 import plotly.express as px
 import streamlit as st
-from streamlit.components.v1 import html
 
 
 def sales_header():
@@ -10,30 +8,37 @@ def sales_header():
     st.title('Locations :earth_americas:')
 
 
-def filter_data(df, category_filter, size_filter, season_filter):
+def filter_data(source, category_filter, size_filter, season_filter):
 
-    filt = (df["Category"].isin(category_filter)) &\
-        (df["Size"].isin(size_filter)) &\
-        (df["Season"].isin(season_filter))
-
-    return df[filt]
+    return source.select({"Category": category_filter,
+                         "Size": size_filter,
+                         "Season": season_filter})
 
 
 # Function To Get The latitude and longitude for each Location
+# (bundled with the app, so the map never touches the network)
 @st.cache_data
 def load__locations_data():
-    positions = pd.read_csv(
-        "https://raw.githubusercontent.com/jasperdebie/VisInfo/master/us-state-capitals.csv")
+    positions = pd.read_csv("data/us-state-capitals.csv")
 
     return positions
 
 
-def create_map(the_df):
+# Per-State Breakdowns Shared By All The Locations Charts
+LOCATION_BREAKDOWNS = ["Subscription_Status", "Category"]
+
+
+def location_summary(the_slice):
+    return the_slice.summarize("Location", LOCATION_BREAKDOWNS)
+
+
+def create_map(the_slice):
     pos = load__locations_data()
 
-    alt_df = the_df.merge(pos, left_on="Location", right_on="name", how="left")
-    alt_df = alt_df.groupby(["Location", "latitude", "longitude"], as_index=False)[
-        "Price_in_USD"].sum()
+    # Sales Are Summed Per State First, So Only The ~50 States Get Joined
+    alt_df = location_summary(the_slice)["totals"]["Price_in_USD"]\
+        .reset_index()
+    alt_df = alt_df.merge(pos, left_on="Location", right_on="name")
 
     fig = px.scatter_mapbox(alt_df, lat="latitude",
                             lon="longitude", hover_name="Location",
@@ -64,20 +69,20 @@ def create_map(the_df):
     return fig
 
 
-def get_top_n(the_df, n):
-    top_n_location = the_df.groupby("Location")["Price_in_USD"]\
-        .sum().nlargest(n)
+def get_top_n(the_slice, n):
+    summary = location_summary(the_slice)
+    top_n_location = summary["totals"]["Price_in_USD"].nlargest(n)
     top_n_location = top_n_location.index.tolist()
 
-    filt = the_df["Location"].isin(top_n_location)
-    return the_df[filt]
+    return summary[summary.index.isin(top_n_location)]
 
 
-def create_subscription_via_location(the_df):
-    dff = get_top_n(the_df, 10)
+def create_subscription_via_location(the_slice):
+    dff = get_top_n(the_slice, 10)
 
-    subscription_via_loc = dff.groupby("Location")["Subscription_Status"]\
-        .value_counts().unstack()
+    subscription_via_loc = dff["Subscription_Status"]\
+        .rename_axis(columns="Subscription_Status")
+    subscription_via_loc = subscription_via_loc.where(subscription_via_loc > 0)
 
     total = subscription_via_loc["No"] + subscription_via_loc["Yes"]
 
@@ -124,10 +129,11 @@ def create_subscription_via_location(the_df):
     return fig
 
 
-def create_location_category(the_df):
-    dff = get_top_n(the_df, 5)
-    category_via_loc = dff.groupby("Location", as_index=False)["Category"]\
-        .value_counts()
+def create_location_category(the_slice):
+    dff = get_top_n(the_slice, 5)
+    category_via_loc = dff["Category"].rename_axis(columns="Category")\
+        .stack().rename("count").reset_index()
+    category_via_loc = category_via_loc[category_via_loc["count"] > 0]
 
     fig = px.sunburst(category_via_loc, path=['Location', 'Category'],
                       values='count',
@@ -163,8 +169,10 @@ def create_location_category(the_df):
     return fig
 
 
-def create_top3_review(the_df):
-    loc_review = the_df.groupby("Location")["Review_Rating"].mean().nlargest(3)
+def create_top3_review(the_slice):
+    totals = location_summary(the_slice)["totals"]
+    loc_review = (totals["Review_Rating"] / totals["Review_Rating_count"])\
+        .rename("Review_Rating").nlargest(3)
     fig = px.bar(loc_review,
                  color_discrete_sequence=["#FF0060",
                                           "#00DFA2", "#0079FF", "#F6FA70"],
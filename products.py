@@ -1,9 +1,8 @@
 # Importing Libraries
-import pandas as pd
-import numpy as np
 import plotly.express as px
 import streamlit as st
-from streamlit.components.v1 import html
+
+import labels
 
 
 def products_header():
@@ -11,45 +10,40 @@ def products_header():
     st.title("Products :shopping_bags:")
 
 
-def filter_data(df, category_filter, size_filter, location_filter):
-    if location_filter == "ALL":
-        filt = (df["Category"].isin(category_filter)) &\
-            (df["Size"].isin(size_filter))
-
-    else:
-        filt = (df["Category"].isin(category_filter)) &\
-            (df["Size"].isin(size_filter)) &\
-            (df["Location"] == location_filter)
+def filter_data(source, category_filter, size_filter, location_filter):
+    filters = {"Category": category_filter, "Size": size_filter}
+    if location_filter != "ALL":
+        filters["Location"] = location_filter
 
-    return df[filt]
+    return source.select(filters)
 
 
-def number_of_products(the_df):
-    return the_df["Item_Purchased"].nunique()
+def number_of_products(the_slice):
+    return the_slice.nunique("Item_Purchased")
 
 
-def number_of_category(the_df):
-    return the_df["Category"].nunique()
+def number_of_category(the_cube):
+    return len(the_cube.options("Category"))
 
 
-def total_sales(the_df):
-    return f'{the_df["Price_in_USD"].sum():,.0f}'
+def total_sales(the_slice):
+    return f'{the_slice.sum("Price_in_USD"):,.0f}'
 
 
-def create_products_chart(the_df):
+def create_products_chart(the_slice):
     # products_sales = the_df.groupby("Item_Purchased")["Price_in_USD"]\
     #     .sum().nlargest(15)
 
-    top_10_products = the_df["Item_Purchased"].value_counts().nlargest(10)
+    top_10_products = the_slice.top_counts("Item_Purchased", 10)
+    popularity = labels.shares(top_10_products)
 
     fig = px.bar(top_10_products,
                  x=top_10_products.index,
-                 y=(top_10_products / sum(top_10_products)) * 100,
+                 y=popularity,
                  color=top_10_products.index,
                  color_discrete_sequence=["#FF0060"],
                  template="plotly_dark",
-                 text=top_10_products.apply(
-                     lambda x: f"{ (x / sum(top_10_products)) * 100:0.0f}%"),
+                 text=labels.percent_labels(popularity),
                  labels={"index": "Product",  "y": "Popularity (%)"},
                  title="\t\tTop 10 Products",
                  )
@@ -81,8 +75,8 @@ def create_products_chart(the_df):
     return fig
 
 
-def create_size_chart(the_df):
-    size = the_df["Size"].value_counts()
+def create_size_chart(the_slice):
+    size = the_slice.value_counts("Size")
 
     fig = px.pie(names=size.index,
                  values=size,
@@ -121,9 +115,8 @@ def create_size_chart(the_df):
     return fig
 
 
-def category_via_season_chart(the_df):
-    category_season = the_df.groupby("Season")["Category"]\
-        .value_counts().unstack()
+def category_via_season_chart(the_slice):
+    category_season = the_slice.crosstab("Season", "Category")
 
     fig = px.line(category_season,
                   template="plotly_dark",
@@ -0,0 +1,188 @@
+import importlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+
+logger = logging.getLogger("shopping_trends.profile")
+
+# Set To 1 (Or Open The App With ?profile=1) To Time Every Stage Of A Rerun
+PROFILE_ENV = "SHOPPING_TRENDS_PROFILE"
+
+# Set To 1 As Well To Trace Python Allocations While Profiling (Slower)
+MEMORY_ENV = "SHOPPING_TRENDS_PROFILE_MEMORY"
+
+# Process-Wide Totals Per (page, stage), Exported In Prometheus Text Format
+_totals = {}
+_totals_lock = threading.Lock()
+
+# Process-Wide Totals Of The Per-Rerun Memory Figures, Per (page, name)
+_memory_totals = {}
+
+# Seconds Spent On The First Import Of Each Lazily Loaded Module
+import_seconds = {}
+
+
+def _ensure_handler():
+    # Streamlit Doesn't Configure Our Logger, So Give It One Plain Handler
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+def profiling_enabled(query_params=None):
+    if os.environ.get(PROFILE_ENV, "") == "1":
+        return True
+    return query_params is not None and query_params.get("profile") == "1"
+
+
+def session_bytes(values):
+    """Rough bytes held by a session's state.
+
+    Frames and arrays count their buffers, slices report their own
+    memory (not the cube they share with every session), containers are
+    walked and anything else counts as its shallow size.
+    """
+    total = 0
+    for value in values:
+        if hasattr(value, "nbytes") and callable(value.nbytes):
+            total += value.nbytes()
+        elif isinstance(value, pd.DataFrame):
+            total += int(value.memory_usage(deep=True).sum())
+        elif isinstance(value, pd.Series):
+            total += int(value.memory_usage(deep=True))
+        elif isinstance(value, np.ndarray):
+            total += value.nbytes
+        elif isinstance(value, (list, tuple, set)):
+            total += sys.getsizeof(value) + session_bytes(value)
+        elif isinstance(value, dict):
+            total += sys.getsizeof(value) + session_bytes(value.values())
+        else:
+            total += sys.getsizeof(value)
+    return total
+
+
+class StageTimer:
+    """Collects the wall time of each stage of one rerun.
+
+    When disabled every ``stage`` block runs untimed, so the timer can stay
+    wired into the page code at no cost. With MEMORY_ENV set it also
+    records the peak of traced allocations above the rerun's starting
+    point; tracemalloc is process-wide, so concurrent reruns blur it.
+    """
+
+    def __init__(self, enabled, page=""):
+        self.enabled = enabled
+        self.page = page
+        self.stages = []
+        self.memory = {}
+
+        self._traced_from = None
+        if enabled and os.environ.get(MEMORY_ENV, "") == "1":
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._traced_from = tracemalloc.get_traced_memory()[0]
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, time.perf_counter() - started))
+
+    def time(self, name, fn, *args):
+        with self.stage(name):
+            return fn(*args)
+
+    def total(self):
+        return sum(seconds for _, seconds in self.stages)
+
+    def account(self, session_state):
+        if not self.enabled:
+            return
+
+        self.memory["session_bytes"] = session_bytes(session_state.values())
+        if self._traced_from is not None:
+            peak = tracemalloc.get_traced_memory()[1]
+            self.memory["rerun_peak_bytes"] = max(0, peak - self._traced_from)
+
+    def publish(self):
+        if not self.enabled:
+            return
+
+        with _totals_lock:
+            _ensure_handler()
+            for name, seconds in self.stages:
+                count, total = _totals.get((self.page, name), (0, 0.0))
+                _totals[(self.page, name)] = (count + 1, total + seconds)
+
+            for name, n_bytes in self.memory.items():
+                count, total = _memory_totals.get((self.page, name), (0, 0))
+                _memory_totals[(self.page, name)] = (count + 1,
+                                                     total + n_bytes)
+
+        for name, seconds in self.stages:
+            logger.info(json.dumps({"event": "stage", "page": self.page,
+                                    "stage": name,
+                                    "seconds": round(seconds, 6)}))
+
+        logger.info(json.dumps({"event": "rerun", "page": self.page,
+                                "seconds": round(self.total(), 6),
+                                **self.memory}))
+
+
+def timed_import(name):
+    if name in sys.modules:
+        return sys.modules[name]
+
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    import_seconds[name] = time.perf_counter() - started
+    return module
+
+
+def prometheus_text():
+    lines = ["# HELP dashboard_stage_seconds Wall time spent per rerun stage.",
+             "# TYPE dashboard_stage_seconds summary"]
+
+    with _totals_lock:
+        totals = sorted(_totals.items())
+        memory_totals = sorted(_memory_totals.items())
+
+    for (page, name), (count, total) in totals:
+        labels = f'page="{page}",stage="{name}"'
+        lines.append(f"dashboard_stage_seconds_count{{{labels}}} {count}")
+        lines.append(f"dashboard_stage_seconds_sum{{{labels}}} {total:.6f}")
+
+    lines.append("# HELP dashboard_rerun_bytes Session-held and peak traced "
+                 "bytes per rerun.")
+    lines.append("# TYPE dashboard_rerun_bytes summary")
+    for (page, name), (count, total) in memory_totals:
+        labels = f'page="{page}",kind="{name}"'
+        lines.append(f"dashboard_rerun_bytes_count{{{labels}}} {count}")
+        lines.append(f"dashboard_rerun_bytes_sum{{{labels}}} {total}")
+
+    lines.append("# HELP dashboard_import_seconds First import of a page module.")
+    lines.append("# TYPE dashboard_import_seconds gauge")
+    for name, seconds in sorted(import_seconds.items()):
+        labels = f'module="{name}"'
+        lines.append(f"dashboard_import_seconds{{{labels}}} {seconds:.6f}")
+
+    return "\n".join(lines) + "\n"
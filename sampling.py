@@ -0,0 +1,212 @@
+import hashlib
+import io
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+import loader
+import cube
+
+
+# Set To 1 To Serve Estimates From A Sample While The Exact Cube Loads
+APPROXIMATE_ENV = "SHOPPING_TRENDS_APPROXIMATE"
+
+# Random Blocks Of The Source File Read For The Sample
+SAMPLE_BLOCKS = 256
+BLOCK_BYTES = 64 * 1024
+
+# Bumped When The Way Blocks Are Drawn Changes, So Older Snapshots Don't Match
+SAMPLE_DESIGN = 2
+
+# Two-Sided 95% Normal Quantile
+Z_95 = 1.96
+
+# Which Estimate Each KPI Tile Shows, By Function Name
+KPI_ESTIMATES = {
+    "total_customers": ("count", None),
+    "avergae_rating": ("mean", "Review_Rating"),
+    "total_purchases": ("sum", "Previous_Purchases"),
+    "total_sales": ("sum", "Price_in_USD"),
+}
+
+
+def _lines_starting(f, begin, end):
+    # Whole Lines Starting In [begin, end), The Last One Finished Past end
+    f.seek(begin - 1)
+    block = f.read(end - begin + 1)
+    newline = block.find(b"\n", 0, len(block) - 1)
+    if newline < 0:
+        return b""
+
+    lines = block[newline + 1:]
+    if not lines.endswith(b"\n"):
+        lines += f.readline()
+    if lines and not lines.endswith(b"\n"):
+        lines += b"\n"
+    return lines
+
+
+def read_sample(the_file_path, n_blocks=SAMPLE_BLOCKS,
+                block_bytes=BLOCK_BYTES, seed=0):
+    """Rows from one random block in each of ``n_blocks`` equal stretches.
+
+    Returns ``(df, block_ids, sampled_share)``: the block each row came
+    from (blocks numbered in file order) and the share of the file's
+    bytes the blocks cover. A row belongs to the block its first byte
+    falls in, and a block that runs past the end of its stretch wraps to
+    the stretch's start, so every row is equally likely to be sampled.
+    Spreading the blocks over the file stratifies the sample on the
+    file's order: a file sorted by, say, Location still gets every state's
+    rows in proportion. A file no bigger than the sample is read whole,
+    as a single block.
+    """
+    size = os.path.getsize(the_file_path)
+    with open(the_file_path, "rb") as f:
+        header = f.readline()
+        start = len(header)
+
+        if (size - start) // block_bytes <= n_blocks:
+            df = loader.prepare_frame(pd.read_csv(the_file_path))
+            return df, np.zeros(len(df), dtype="int64"), 1.0
+
+        stretch = (size - start) / n_blocks
+        rng = np.random.default_rng(seed)
+
+        blocks = []
+        for position, offset in enumerate(rng.random(n_blocks) * stretch):
+            first = start + round(position * stretch)
+            last = start + round((position + 1) * stretch)
+            begin = first + int(offset)
+
+            block = _lines_starting(f, begin, min(begin + block_bytes, last))
+            if begin + block_bytes > last:
+                block += _lines_starting(f, first,
+                                         first + begin + block_bytes - last)
+            blocks.append(block)
+
+    df = pd.read_csv(io.BytesIO(header + b"".join(blocks)))
+    block_ids = np.repeat(np.arange(n_blocks),
+                          [block.count(b"\n") for block in blocks])
+    sampled_share = n_blocks * block_bytes / (size - start)
+    return loader.prepare_frame(df), block_ids, sampled_share
+
+
+def sample_version(the_file_path, n_blocks, block_bytes):
+    fingerprint = json.dumps([loader.file_fingerprint(the_file_path),
+                              n_blocks, block_bytes, SAMPLE_DESIGN])
+    return hashlib.sha256(fingerprint.encode()).hexdigest()[:12] + ".sample"
+
+
+def sample_cube(the_file_path, n_blocks=SAMPLE_BLOCKS,
+                block_bytes=BLOCK_BYTES, seed=0):
+    df, block_ids, sampled_share = read_sample(the_file_path, n_blocks,
+                                               block_bytes, seed)
+
+    # Each Row's Block And Cell (In The Cube's Cell Order) For The Intervals
+    sample = df[cube.MEASURES].astype("float64").reset_index(drop=True)
+    sample["block"] = block_ids
+    sample["cell"] = df.groupby(cube.DIMENSIONS, observed=True).ngroup()\
+        .fillna(-1).to_numpy(dtype="int64")
+
+    cells, counts = cube.aggregate(df)
+    return SampleCube(cells, counts, sample, block_ids.max() + 1,
+                      sampled_share,
+                      sample_version(the_file_path, n_blocks, block_bytes))
+
+
+class SampleCube(cube.Cube):
+    """A Cube estimated from a block sample of rows, scaled to the file.
+
+    Row counts, sums and value counts are the sample's over
+    ``sampled_share`` (left unrounded, so shares and means come out as the
+    sample's). ``sample`` keeps each sampled row's block, cell and
+    measures, which ``margin`` needs for confidence intervals.
+    """
+
+    def __init__(self, cells, counts, sample, n_blocks, sampled_share,
+                 version=""):
+        self.sample = sample
+        self.n_blocks = n_blocks
+        self.sampled_share = sampled_share
+        self.sample_rows = len(sample)
+        self.estimated_rows = round(self.sample_rows / sampled_share)
+
+        super().__init__(cells, counts, version)
+
+        scaled = cube.MEASURES + list(cube.MEASURE_COUNTS.values()) + \
+            ["count"]
+        self.cells[scaled] = self.cells[scaled] / sampled_share
+        self.counts = {col: table / sampled_share
+                       for col, table in self.counts.items()}
+
+
+def _total_error(block_totals, sampled_share):
+    """Standard error of the sum of ``block_totals`` over the sample.
+
+    The blocks are the sampling units, one per stretch of the file, so
+    the variance comes from the differences between neighbouring blocks
+    (the usual estimator for one unit per stratum), with the finite
+    population correction.
+    """
+    n_blocks = len(block_totals)
+    if n_blocks < 2:
+        return 0.0
+
+    variance = (1 - sampled_share) * n_blocks * \
+        np.sum(np.diff(block_totals) ** 2) / (2 * (n_blocks - 1))
+    return math.sqrt(max(0.0, variance))
+
+
+def margin(the_slice, kind, measure=None):
+    """Half-width of the 95% confidence interval of a slice estimate.
+
+    ``kind`` is "count" (rows in the slice), "sum" (of ``measure`` over
+    the slice) or "mean" (of ``measure`` within the slice). Counts and
+    sums are the sampled blocks' totals scaled up to the file; a mean is
+    their ratio, whose error comes from the blocks' residuals.
+    """
+    the_cube = the_slice.cube
+    sample = the_cube.sample
+
+    selected = np.zeros(len(the_cube.cells), dtype=bool)
+    selected[the_slice.positions] = True
+    cells = sample["cell"].to_numpy()
+    in_slice = (cells >= 0) & selected[np.maximum(cells, 0)]
+
+    def per_block(weights):
+        return np.bincount(sample["block"].to_numpy(), weights=weights,
+                           minlength=the_cube.n_blocks)
+
+    rows = per_block(in_slice.astype("float64"))
+    if kind == "count":
+        return Z_95 * _total_error(rows, the_cube.sampled_share) / \
+            the_cube.sampled_share
+
+    values = sample[measure].to_numpy()
+    sums = per_block(np.where(in_slice, np.nan_to_num(values), 0.0))
+    if kind == "sum":
+        return Z_95 * _total_error(sums, the_cube.sampled_share) / \
+            the_cube.sampled_share
+
+    # A Mean Only Counts The Rows That Have A Value
+    rows = per_block((in_slice & ~np.isnan(values)).astype("float64"))
+    if rows.sum() == 0:
+        return np.nan
+    residuals = sums - sums.sum() / rows.sum() * rows
+    return Z_95 * _total_error(residuals, the_cube.sampled_share) / rows.sum()
+
+
+def kpi_margin(kpi, the_slice):
+    if not isinstance(the_slice.cube, SampleCube):
+        return None
+    if kpi.__name__ not in KPI_ESTIMATES:
+        return None
+
+    kind, measure = KPI_ESTIMATES[kpi.__name__]
+    value = margin(the_slice, kind, measure)
+    if kind == "mean":
+        return f"± {value:,.2f}"
+    return f"± {value:,.0f}"
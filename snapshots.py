@@ -0,0 +1,160 @@
+import json
+import os
+import threading
+
+import loader
+import figure_cache
+import profiling
+
+
+SNAPSHOT_DIR = os.path.join(loader.CACHE_DIR, "snapshots")
+
+# KPIs And Charts Each Page Shows On First Paint, By Name In Its Module
+DEFAULT_VIEWS = {
+    "home": (["total_customers", "avergae_rating", "total_purchases"],
+             ["create_category_chart", "create_gender_chart",
+              "create_shipping_chart"]),
+    "products": (["total_sales", "number_of_products"],
+                 ["create_products_chart", "create_size_chart",
+                  "category_via_season_chart"]),
+    "locations": ([],
+                  ["create_map", "create_subscription_via_location",
+                   "create_location_category", "create_top3_review"]),
+    "distributions": (["median_age", "median_price", "median_rating"],
+                      ["create_age_chart", "create_price_chart",
+                       "create_rating_chart"]),
+}
+
+
+def default_filters(module_name, the_cube):
+    # Everything Selected, Just Like The Sidebar Widgets Start Out
+    categories = the_cube.options("Category")
+    sizes = the_cube.options("Size")
+    if module_name == "locations":
+        return categories, sizes, the_cube.options("Season")
+    if module_name == "distributions":
+        return categories, sizes, "ALL", the_cube.options("Season")
+    return categories, sizes, "ALL"
+
+
+def _rows(the_cube):
+    return the_cube.select({}).count()
+
+
+class Snapshots:
+    """Default-view KPIs and figures, precomputed once per dataset version.
+
+    ``warm`` puts the figure JSON of every page's unfiltered view into the
+    shared FigureCache and keeps its KPI values. The snapshot is also
+    written under ``directory``, so a restarted process (or another worker)
+    serving the same version reads it instead of rebuilding the charts.
+
+    ``claim`` hands each version to exactly one caller, so a version is
+    warmed at most once per process even if warming it fails.
+    """
+
+    def __init__(self, figures, directory=SNAPSHOT_DIR):
+        self.figures = figures
+        self.directory = directory
+        self.version = None
+        self.kpis = {}
+        self.claimed = None
+        self._lock = threading.Lock()
+        self._claim_lock = threading.Lock()
+
+    def claim(self, version):
+        with self._claim_lock:
+            if self.claimed == version:
+                return False
+            self.claimed = version
+            return True
+
+    def kpi(self, kpi, the_slice, filters, version):
+        key = figure_cache.figure_key(kpi.__module__ + "." + kpi.__name__,
+                                      filters, version)
+        value = self.kpis.get(key)
+        return kpi(the_slice) if value is None else value
+
+    def warm(self, the_cube):
+        # An Older Version May Still Be Warming Up, Queue Behind It
+        with self._lock:
+            if self.version == the_cube.version:
+                return False
+
+            snapshot = self._read(the_cube)
+            if snapshot is None:
+                snapshot = self._build(the_cube)
+                self._write(snapshot)
+
+            kpis = {}
+            for module_name, page in snapshot["pages"].items():
+                for name, value in page["kpis"].items():
+                    key = figure_cache.figure_key(f"{module_name}.{name}",
+                                                  page["filters"],
+                                                  snapshot["version"])
+                    kpis[key] = value
+
+                for name, fig_json in page["figures"].items():
+                    key = figure_cache.figure_key(f"{module_name}.{name}",
+                                                  page["filters"],
+                                                  snapshot["version"])
+                    self.figures.put(key, fig_json)
+
+            self.kpis = kpis
+            self.version = the_cube.version
+            return True
+
+    def _path(self, version):
+        return os.path.join(self.directory, f"{version}.json")
+
+    def _build(self, the_cube):
+        pages = {}
+        for module_name, (kpis, charts) in DEFAULT_VIEWS.items():
+            module = profiling.timed_import(module_name)
+            filters = default_filters(module_name, the_cube)
+            the_slice = module.filter_data(the_cube, *filters)
+
+            pages[module_name] = {
+                "filters": filters,
+                "kpis": {name: getattr(module, name)(the_slice)
+                         for name in kpis},
+                "figures": {name: figure_cache.compact_json(
+                                getattr(module, name)(the_slice))
+                            for name in charts},
+            }
+
+        return {"version": the_cube.version, "rows": _rows(the_cube),
+                "pages": pages}
+
+    def _read(self, the_cube):
+        try:
+            with open(self._path(the_cube.version)) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # Append Counts Are Per Process, So Check The Rows Really Match
+        if snapshot["rows"] != _rows(the_cube):
+            return None
+
+        # Written Before A Page Was Added
+        if set(snapshot["pages"]) != set(DEFAULT_VIEWS):
+            return None
+        return snapshot
+
+    def _write(self, snapshot):
+        def write(tmp_path):
+            with open(tmp_path, "w") as f:
+                json.dump(snapshot, f)
+
+        os.makedirs(self.directory, exist_ok=True)
+        loader._write_atomic(self._path(snapshot["version"]), write)
+
+        # Only The Latest Version Is Worth Keeping Around
+        for name in os.listdir(self.directory):
+            if name != f"{snapshot['version']}.json" and \
+                    not name.endswith(".tmp"):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
@@ -0,0 +1,132 @@
+# The Cube And DuckDB Backends Checked Against Plain pandas On The Rows
+import numpy as np
+import pandas as pd
+import pytest
+
+import cube
+import loader
+
+
+DATASET = "shopping_trends_updated.csv"
+
+SELECTIONS = {
+    "all": {},
+    "some": {"Category": ["Clothing", "Footwear"], "Season": ["Winter"],
+             "Location": ["Alaska", "Texas", "Montana"]},
+    "empty": {"Category": []},
+}
+
+QUANTILES = [0, 0.25, 0.5, 0.75, 0.9, 1]
+
+
+@pytest.fixture(scope="module", params=["bundled", "with_nan"])
+def the_file_path(request, tmp_path_factory):
+    if request.param == "bundled":
+        return DATASET
+
+    # Every Few Rows Miss A Measure, A Distribution Value Or A Counted Column
+    df = pd.read_csv(DATASET)
+    positions = np.arange(len(df))
+    df.loc[positions % 7 == 0, "Review Rating"] = np.nan
+    df.loc[positions % 11 == 0, "Purchase Amount (USD)"] = np.nan
+    df.loc[positions % 13 == 0, "Age"] = np.nan
+    df.loc[positions % 17 == 0, "Gender"] = np.nan
+
+    the_path = tmp_path_factory.mktemp("data") / "with_nan.csv"
+    df.to_csv(the_path, index=False)
+    return str(the_path)
+
+
+@pytest.fixture(scope="module")
+def rows(the_file_path):
+    return loader.parse_csv(the_file_path)
+
+
+@pytest.fixture(scope="module", params=["cube", "chunked", "duckdb"])
+def source(request, the_file_path, rows):
+    if request.param == "cube":
+        return cube.from_frame(rows)
+    if request.param == "chunked":
+        return cube.from_csv(the_file_path, chunk_rows=500)
+
+    pytest.importorskip("duckdb")
+    import duckdb_backend
+    return duckdb_backend.DuckDBCube(duckdb_backend.load_table(the_file_path))
+
+
+@pytest.fixture(params=list(SELECTIONS))
+def selection(request, source, rows):
+    filters = SELECTIONS[request.param]
+    mask = np.ones(len(rows), dtype=bool)
+    for col, values in filters.items():
+        mask &= rows[col].isin(values).to_numpy()
+    return source.select(filters), rows[mask]
+
+
+def _assert_by(got, expected):
+    # Groups With No Rows May Be Left Out Or Reported As Zero
+    index = expected.index.union(got.index)
+    np.testing.assert_allclose(got.reindex(index).fillna(0).to_numpy(float),
+                               expected.reindex(index).fillna(0)
+                               .to_numpy(float))
+
+
+def test_totals(selection):
+    the_slice, expected = selection
+    assert the_slice.count() == len(expected)
+    for measure in cube.MEASURES:
+        assert the_slice.sum(measure) == pytest.approx(expected[measure].sum())
+        np.testing.assert_allclose(the_slice.mean(measure),
+                                   expected[measure].mean())
+
+
+def test_by_dimension(selection):
+    the_slice, expected = selection
+    grouped = expected.groupby("Category", observed=True)
+    _assert_by(the_slice.sum_by("Category"), grouped.size())
+    for measure in cube.MEASURES:
+        _assert_by(the_slice.sum_by("Category", measure),
+                   grouped[measure].sum())
+
+        means = grouped[measure].mean()
+        got = the_slice.mean_by("Category", measure).reindex(means.index)
+        np.testing.assert_allclose(got.to_numpy(float), means.to_numpy(float))
+
+
+@pytest.mark.parametrize("col", ["Size", "Gender", "Item_Purchased"])
+def test_value_counts(selection, col):
+    the_slice, expected = selection
+    _assert_by(the_slice.value_counts(col),
+               expected[col].value_counts())
+
+
+@pytest.mark.parametrize("col", list(cube.DISTRIBUTIONS))
+def test_distributions(selection, col):
+    the_slice, expected = selection
+    values = expected[col].dropna().astype("float64")
+
+    histogram = the_slice.histogram(col)
+    _assert_by(histogram.set_axis(np.round(histogram.index, 10)),
+               np.round(values, 10).value_counts())
+    np.testing.assert_allclose(the_slice.percentiles(col, QUANTILES),
+                               values.quantile(QUANTILES))
+
+
+def test_summarize(selection, source):
+    the_slice, expected = selection
+    summary = the_slice.summarize("Location", ["Category", "Gender"])
+    grouped = expected.groupby("Location", observed=True)
+
+    _assert_by(summary["totals"]["count"], grouped.size())
+    for measure in cube.MEASURES:
+        _assert_by(summary["totals"][measure], grouped[measure].sum())
+        _assert_by(summary["totals"][cube.MEASURE_COUNTS[measure]],
+                   grouped[measure].count())
+
+    # Every Option Gets A Column, Whatever Was Selected
+    assert list(summary["Category"].columns) == \
+        list(source.options("Category"))
+    for col in ["Category", "Gender"]:
+        crosstab = pd.crosstab(expected["Location"], expected[col])
+        for value in crosstab.columns:
+            _assert_by(summary[col][value], crosstab[value])